@@ -10,10 +10,15 @@ from datetime import datetime
 from typing import List, Dict, Optional
 import random
 
-from .scenarios import CHENNAI_SCENARIOS, DEPOT_INVENTORY, ZONES
+from .scenarios import (
+    CHENNAI_SCENARIOS, DEPOT_TOTALS, ZONES, build_similarity_table, find_similar, average_resources
+)
 from .routing import find_routes_to_zones, a_star_route, find_alternative_route
 from .models import ScenarioInput, ScenarioRequest, DecisionResponse
-from .ml_models import DemandPredictionModel, ScenarioClassifier, train_models
+from .ml_models import (
+    DemandPredictionModel, ScenarioClassifier, train_models, read_scenario_file,
+    MODEL_DIR, MODEL_METADATA_PATH
+)
 
 class ReliefRouteAgent:
     """Autonomous disaster relief decision-making agent"""
@@ -26,6 +31,7 @@ class ReliefRouteAgent:
             "infrastructure": 1.0
         }
         self.historical_scenarios = self._load_historical_scenarios()
+        self.similarity_table = build_similarity_table(self.historical_scenarios or CHENNAI_SCENARIOS)
         
         # Initialize ML models
         self.demand_model = DemandPredictionModel()
@@ -34,17 +40,15 @@ class ReliefRouteAgent:
         self._load_ml_models()
         
     def _load_historical_scenarios(self) -> List[Dict]:
-        """Load historical scenarios from JSON files or fallback to hardcoded"""
+        """Load historical scenarios from JSON/NDJSON files or fallback to hardcoded"""
         scenarios = []
         data_dir = os.path.join(os.path.dirname(__file__), 'data', 'scenarios')
         
         if os.path.exists(data_dir):
             for filename in os.listdir(data_dir):
-                if filename.endswith('.json'):
+                if filename.endswith(('.json', '.ndjson')):
                     try:
-                        with open(os.path.join(data_dir, filename), 'r') as f:
-                            scenario = json.load(f)
-                            scenarios.append(scenario)
+                        scenarios.extend(read_scenario_file(os.path.join(data_dir, filename)))
                     except Exception as e:
                         print(f"Error loading {filename}: {e}")
         
@@ -57,21 +61,13 @@ class ReliefRouteAgent:
     def _load_ml_models(self):
         """Load pre-trained ML models (no training on startup)"""
         try:
-            model_dir = os.path.join(os.path.dirname(__file__), 'models')
-            if os.path.exists(model_dir) and os.path.exists(os.path.join(model_dir, 'model_metadata.pkl')):
-                self.demand_model.load(model_dir)
+            # The metadata file only exists inside the model directory, so one check covers both
+            if os.path.exists(MODEL_METADATA_PATH):
+                self.demand_model.load(MODEL_DIR)
                 self.ml_models_loaded = self.demand_model.is_trained
                 
                 # Load risk classifier if saved
-                classifier_path = os.path.join(model_dir, 'classifier.pkl')
-                if os.path.exists(classifier_path):
-                    import pickle
-                    with open(classifier_path, 'rb') as f:
-                        classifier_data = pickle.load(f)
-                    self.risk_classifier.vectorizer = classifier_data.get('vectorizer')
-                    self.risk_classifier.model = classifier_data.get('model')
-                    self.risk_classifier.num_features_count = classifier_data.get('num_features_count', 5)
-                    self.risk_classifier.is_trained = True
+                self.risk_classifier.load(MODEL_DIR)
                 
                 if self.ml_models_loaded:
                     print("✅ ML models loaded successfully (pre-trained)")
@@ -170,25 +166,13 @@ class ReliefRouteAgent:
     
     def find_similar_scenarios(self, scenario: Dict, top_k: int = 3) -> List[Dict]:
         """Find most similar historical scenarios"""
-        all_scenarios = self.historical_scenarios if self.historical_scenarios else CHENNAI_SCENARIOS
-        
-        # Filter by disaster type first
-        disaster_type = scenario.get("disaster_type")
-        same_type = [s for s in all_scenarios if s.get("disaster_type") == disaster_type]
-        
-        if not same_type:
-            same_type = all_scenarios  # Fall back to all scenarios
-        
-        similarities = []
-        for hist in same_type:
-            dist = self.calculate_scenario_similarity(scenario, hist)
-            similarities.append({
-                "scenario": hist,
-                "distance": round(dist, 3)
-            })
-        
-        similarities.sort(key=lambda x: x["distance"])
-        return similarities[:top_k]
+        # Same metric as calculate_scenario_similarity, over the precomputed feature matrix
+        indices, distances = find_similar(scenario, top_k, self.similarity_table)
+        all_scenarios = self.similarity_table["scenarios"]
+        return [
+            {"scenario": all_scenarios[i], "distance": dist, "index": i}
+            for i, dist in zip(indices.tolist(), distances.tolist())
+        ]
     
     def estimate_resources(self, scenario: Dict, similar_scenarios: List[Dict]) -> Dict:
         """Estimate required resources using ML models with rule-based fallback"""
@@ -234,8 +218,9 @@ class ReliefRouteAgent:
         
         # Adjust based on similar scenarios
         if similar_scenarios:
-            avg_kits = sum(s["scenario"].get("resources_deployed", {}).get("medical_kits", 0) 
-                         for s in similar_scenarios) / len(similar_scenarios)
+            # One mean over the packed resource rows of the matched scenarios
+            avg_kits = average_resources([s["index"] for s in similar_scenarios],
+                                         self.similarity_table)["medical_kits"]
             if avg_kits > 0:
                 # Final blend: 50% current estimate, 50% historical average
                 medical_kits_needed = int((medical_kits_needed + avg_kits) / 2)
@@ -318,26 +303,13 @@ class ReliefRouteAgent:
     
     def check_inventory(self, required: Dict, available_resources: Dict = None) -> Dict:
         """Check available inventory against requirements"""
+        # Start from the depot inventory, summed once at import
         total_available = {
-            "medical_kits": 0,
-            "food_packets": 0,
-            "water_liters": 0,
-            "shelter_kits": 0,
-            "boats": 0,
-            "drones": 0,
-            "trucks": 0,
-            "helicopters": 0
+            key: DEPOT_TOTALS.get(key, 0)
+            for key in ("medical_kits", "food_packets", "water_liters", "shelter_kits",
+                        "boats", "drones", "trucks", "helicopters")
         }
         
-        # Add depot inventory
-        for depot_id, depot in DEPOT_INVENTORY.items():
-            for resource, amount in depot["resources"].items():
-                if resource in total_available:
-                    total_available[resource] += amount
-            for vehicle, count in depot["vehicles"].items():
-                if vehicle in total_available:
-                    total_available[vehicle] += count
-        
         # Add user-specified available resources if provided
         if available_resources:
             total_available["medical_kits"] = max(total_available["medical_kits"], 
@@ -549,8 +521,9 @@ class ReliefRouteAgent:
             "zones_impacted": input_data.zones_impacted,
             "hospital_load_pct": input_data.hospital_load_pct,
             "blocked_roads": input_data.blocked_roads,
-            "available_resources": input_data.available_resources.dict() if input_data.available_resources else {},
-            "disaster_specific": input_data.disaster_specific.dict() if input_data.disaster_specific else {},
+            "available_resources": input_data.available_resources.model_dump() if input_data.available_resources else {},
+            # Only the disaster blocks the client actually sent; unset ones would be None
+            "disaster_specific": input_data.disaster_specific.model_dump(exclude_none=True) if input_data.disaster_specific else {},
             "notes": input_data.notes
         }
         
@@ -1,10 +1,13 @@
 """
 ReliefRoute Backend API
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import List, Optional
+from pydantic import TypeAdapter
+import asyncio
 import uuid
 import random
 
@@ -12,16 +15,32 @@ from .models import (
     LoginRequest, SignupRequest, UserResponse,
     ScenarioRequest, ScenarioInput, DispatchRequest, DecisionActionRequest,
     ZoneResponse, RouteResponse, InventoryResponse, 
-    DecisionResponse, AgentResponse, ActivityLog
+    DecisionResponse, AgentResponse, ActivityLog, SEVERITY_LABELS
 )
 from .scenarios import DEPOT_INVENTORY, ZONES, CHENNAI_SCENARIOS
 from .agent import agent
 from .routing import a_star_route
 
+# orjson encodes dict responses in native code; fall back to the stdlib encoder
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the shared OSRM client's pooled connections on shutdown"""
+    yield
+    from .ors_client import close_client
+    await close_client()
+
 app = FastAPI(
     title="ReliefRoute API",
     description="Autonomous Disaster Relief Logistics System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan
 )
 
 #Cutom endpoint to check if the backend is running
@@ -54,6 +73,20 @@ activity_logs = []
 active_routes = []
 active_zones = []
 
+# Handlers below already build typed models, so they serialize straight to
+# JSON instead of letting response_model validate every response again
+_USER_ADAPTER = TypeAdapter(UserResponse)
+_ZONES_ADAPTER = TypeAdapter(List[ZoneResponse])
+_ROUTES_ADAPTER = TypeAdapter(List[RouteResponse])
+_INVENTORY_ADAPTER = TypeAdapter(List[InventoryResponse])
+_ACTIVITY_LOGS_ADAPTER = TypeAdapter(List[ActivityLog])
+_AGENT_ADAPTER = TypeAdapter(AgentResponse)
+_DECISIONS_ADAPTER = TypeAdapter(List[DecisionResponse])
+
+def model_response(adapter: TypeAdapter, content) -> Response:
+    """Serialize already-validated models to a JSON response"""
+    return Response(content=adapter.dump_json(content), media_type="application/json")
+
 def add_activity_log(event_type: str, description: str, details: dict = None):
     log = ActivityLog(
         id=str(uuid.uuid4())[:8],
@@ -159,7 +192,7 @@ initialize_sample_data()
 
 # ============== Authentication Endpoints ==============
 
-@app.post("/api/auth/login", response_model=UserResponse)
+@app.post("/api/auth/login", response_model=None, responses={200: {"model": UserResponse}})
 async def login(request: LoginRequest):
     user = users_db.get(request.email)
     if not user or user["password"] != request.password:
@@ -167,15 +200,15 @@ async def login(request: LoginRequest):
     
     add_activity_log("auth", f"User {user['name']} logged in", {"user_id": user["id"]})
     
-    return UserResponse(
+    return model_response(_USER_ADAPTER, UserResponse(
         id=user["id"],
         name=user["name"],
         email=user["email"],
         role=user["role"],
         token=f"token_{uuid.uuid4().hex[:16]}"
-    )
+    ))
 
-@app.post("/api/auth/signup", response_model=UserResponse)
+@app.post("/api/auth/signup", response_model=None, responses={200: {"model": UserResponse}})
 async def signup(request: SignupRequest):
     if request.email in users_db:
         raise HTTPException(status_code=400, detail="Email already registered")
@@ -191,13 +224,13 @@ async def signup(request: SignupRequest):
     
     add_activity_log("auth", f"New user registered: {request.name}", {"user_id": user_id})
     
-    return UserResponse(
+    return model_response(_USER_ADAPTER, UserResponse(
         id=user_id,
         name=request.name,
         email=request.email,
         role=request.role,
         token=f"token_{uuid.uuid4().hex[:16]}"
-    )
+    ))
 
 @app.post("/api/auth/logout")
 async def logout():
@@ -222,15 +255,15 @@ async def get_dashboard_stats():
         }
     }
 
-@app.get("/api/zones", response_model=List[ZoneResponse])
+@app.get("/api/zones", response_model=None, responses={200: {"model": List[ZoneResponse]}})
 async def get_zones():
-    return active_zones
+    return model_response(_ZONES_ADAPTER, active_zones)
 
-@app.get("/api/routes", response_model=List[RouteResponse])
+@app.get("/api/routes", response_model=None, responses={200: {"model": List[RouteResponse]}})
 async def get_routes():
-    return active_routes
+    return model_response(_ROUTES_ADAPTER, active_routes)
 
-@app.get("/api/inventory", response_model=List[InventoryResponse])
+@app.get("/api/inventory", response_model=None, responses={200: {"model": List[InventoryResponse]}})
 async def get_inventory():
     inventory_list = []
     for depot_id, depot in DEPOT_INVENTORY.items():
@@ -240,11 +273,11 @@ async def get_inventory():
             location=depot["location"],
             resources={**depot["resources"], **depot["vehicles"]}
         ))
-    return inventory_list
+    return model_response(_INVENTORY_ADAPTER, inventory_list)
 
-@app.get("/api/activity-logs", response_model=List[ActivityLog])
+@app.get("/api/activity-logs", response_model=None, responses={200: {"model": List[ActivityLog]}})
 async def get_activity_logs(limit: int = 20):
-    return activity_logs[:limit]
+    return model_response(_ACTIVITY_LOGS_ADAPTER, activity_logs[:limit])
 
 # ============== Agent Endpoints ==============
 
@@ -254,12 +287,11 @@ def convert_to_scenario_input(data) -> ScenarioInput:
         return data
     elif isinstance(data, ScenarioRequest):
         # Convert legacy format
-        severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
         return ScenarioInput(
             city="Chennai",
             disaster_type=data.disaster_type,
             severity_level=data.severity,
-            severity_label=severity_labels.get(data.severity, "Moderate"),
+            severity_label=SEVERITY_LABELS.get(data.severity, "Moderate"),
             population_affected=data.population_affected,
             zones_impacted=data.zones_affected,
             hospital_load_pct=data.hospital_load if data.hospital_load > 1 else data.hospital_load * 100,
@@ -271,12 +303,11 @@ def convert_to_scenario_input(data) -> ScenarioInput:
             return ScenarioInput(**data)
         else:
             # Legacy dict format
-            severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
             return ScenarioInput(
                 city=data.get("city", "Chennai"),
                 disaster_type=data["disaster_type"],
                 severity_level=data.get("severity_level", data.get("severity", 3)),
-                severity_label=data.get("severity_label", severity_labels.get(data.get("severity", 3), "Moderate")),
+                severity_label=data.get("severity_label", SEVERITY_LABELS.get(data.get("severity", 3), "Moderate")),
                 population_affected=data["population_affected"],
                 zones_impacted=data.get("zones_impacted", data.get("zones_affected", [])),
                 hospital_load_pct=data.get("hospital_load_pct", data.get("hospital_load", 0)),
@@ -286,7 +317,7 @@ def convert_to_scenario_input(data) -> ScenarioInput:
                 notes=data.get("notes", "")
             )
 
-@app.post("/api/agent/run", response_model=AgentResponse)
+@app.post("/api/agent/run", response_model=None, responses={200: {"model": AgentResponse}})
 async def run_agent(request: ScenarioInput | ScenarioRequest):
     """Main agent endpoint - processes scenario and returns decision"""
     
@@ -363,15 +394,15 @@ async def run_agent(request: ScenarioInput | ScenarioRequest):
         "risk_level": decision.risk_level
     }
     
-    return AgentResponse(
+    return model_response(_AGENT_ADAPTER, AgentResponse(
         success=True,
         decision=decision,
         dashboard_updates=dashboard_updates
-    )
+    ))
 
-@app.get("/api/decisions", response_model=List[DecisionResponse])
+@app.get("/api/decisions", response_model=None, responses={200: {"model": List[DecisionResponse]}})
 async def get_decisions():
-    return active_decisions
+    return model_response(_DECISIONS_ADAPTER, active_decisions)
 
 @app.post("/api/decisions/{decision_id}/action")
 async def decision_action(decision_id: str, request: DecisionActionRequest):
@@ -446,27 +477,32 @@ async def get_map_routes():
     from .scenarios import ROAD_NETWORK
     from .ors_client import get_route_with_fallback
     
-    routes_with_coords = []
+    # Get waypoints from path nodes
+    route_waypoints = []
     for route in active_routes:
-        # Get waypoints from path nodes
         waypoints = []
         for node in route.path:
             if node in ROAD_NETWORK["nodes"]:
                 coords = ROAD_NETWORK["nodes"][node]["coordinates"]
                 waypoints.append(tuple(coords))
-        
-        # Try to get real road geometry
-        if len(waypoints) >= 2:
-            try:
-                path_coords = await get_route_with_fallback(waypoints)
-            except Exception as e:
-                print(f"Failed to get road geometry: {e}")
-                path_coords = [list(wp) for wp in waypoints]
-        else:
-            path_coords = [list(wp) for wp in waypoints]
-        
+        route_waypoints.append(waypoints)
+    
+    # Fetch real road geometry for every route concurrently over the shared client
+    async def fetch_geometry(waypoints):
+        if len(waypoints) < 2:
+            return [list(wp) for wp in waypoints]
+        try:
+            return await get_route_with_fallback(waypoints)
+        except Exception as e:
+            print(f"Failed to get road geometry: {e}")
+            return [list(wp) for wp in waypoints]
+    
+    geometries = await asyncio.gather(*(fetch_geometry(wp) for wp in route_waypoints))
+    
+    routes_with_coords = []
+    for route, path_coords in zip(active_routes, geometries):
         routes_with_coords.append({
-            **route.dict(),
+            **route.model_dump(),
             "path_coordinates": path_coords
         })
     
@@ -625,6 +661,14 @@ async def get_ml_interpretability(decision_id: str):
             "message": "No ML interpretability data available (rule-based decision)"
         }
 
+@app.get("/api/ml/stats")
+async def get_ml_stats():
+    """Get demand model fast-path hit rate"""
+    return {
+        "ml_models_loaded": agent.ml_models_loaded,
+        "demand_model": agent.demand_model.get_fast_path_stats()
+    }
+
 # Health check
 @app.get("/health")
 async def health_check():
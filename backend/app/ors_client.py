@@ -2,15 +2,29 @@
 OSRM (Open Source Routing Machine) client for real road geometry
 Uses free public OSRM demo server - no API key required!
 """
+import math
 import httpx
+import numpy as np
 import polyline
-from typing import List, Optional, Dict, Tuple
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 # OSRM public demo server (free, no API key needed)
 OSRM_BASE_URL = "https://router.project-osrm.org"
 
-# Cache for route geometries to avoid repeated API calls
-_route_cache: Dict[str, List[List[float]]] = {}
+# LRU cache of encoded polylines (decoded on hit) to avoid repeated API calls
+_MAX_CACHE = 512
+_route_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# HTTP/2 needs the optional h2 package; without it httpx stays on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared client so connections (and TLS sessions) are reused across requests
+_client: Optional[httpx.AsyncClient] = None
 
 # Enable debug logging
 DEBUG = True
@@ -20,6 +34,94 @@ def _log(msg: str):
         print(f"[OSRM] {msg}")
 
 
+def _cache_get(cache_key: str) -> Optional[List[List[float]]]:
+    """Decode a cached route geometry, marking it most recently used"""
+    encoded = _route_cache.get(cache_key)
+    if encoded is None:
+        return None
+    _route_cache.move_to_end(cache_key)
+    return [list(coord) for coord in polyline.decode(encoded)]
+
+
+def _cache_put(cache_key: str, encoded: str):
+    """Store an encoded route geometry, evicting the least recently used"""
+    _route_cache[cache_key] = encoded
+    _route_cache.move_to_end(cache_key)
+    while len(_route_cache) > _MAX_CACHE:
+        _route_cache.popitem(last=False)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared OSRM HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared OSRM HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _fetch_osrm_route(
+    waypoints: List[Tuple[float, float]],
+    profile: str,
+    timeout: float
+) -> Optional[List[List[float]]]:
+    """Fetch (or serve from cache) the OSRM geometry through the given waypoints"""
+    # Create cache key
+    cache_key = "-".join([f"{p[0]:.5f},{p[1]:.5f}" for p in waypoints])
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        _log(f"Cache hit for route ({len(waypoints)} waypoints): {cache_key[:60]}")
+        return cached
+    
+    # OSRM expects lng,lat;lng,lat;... format
+    coords = ";".join([f"{p[1]},{p[0]}" for p in waypoints])
+    url = f"{OSRM_BASE_URL}/route/v1/{profile}/{coords}"
+    _log(f"Requesting ({len(waypoints)} waypoints): {url[:100]}")
+    
+    try:
+        response = await get_client().get(
+            url,
+            params={
+                "overview": "full",
+                "geometries": "polyline"
+            },
+            timeout=timeout
+        )
+        
+        _log(f"Response status: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("code") == "Ok" and data.get("routes"):
+                # Decode polyline to coordinates
+                encoded = data["routes"][0]["geometry"]
+                decoded = polyline.decode(encoded)
+                # decoded is already in [lat, lng] format
+                route_coords = [list(coord) for coord in decoded]
+                _cache_put(cache_key, encoded)
+                _log(f"SUCCESS: Got {len(route_coords)} points for {len(waypoints)} waypoints (following real roads)")
+                return route_coords
+            else:
+                _log(f"OSRM returned no routes: {data.get('code')}, message: {data.get('message', 'N/A')}")
+        else:
+            _log(f"OSRM API error: {response.status_code} - {response.text[:200]}")
+    except Exception as e:
+        _log(f"OSRM request failed: {e}")
+    
+    return None
+
+
 async def get_route_geometry(
     start: Tuple[float, float],
     end: Tuple[float, float],
@@ -36,48 +138,7 @@ async def get_route_geometry(
     Returns:
         List of [lat, lng] coordinates following actual roads
     """
-    # Create cache key
-    cache_key = f"{start[0]:.5f},{start[1]:.5f}-{end[0]:.5f},{end[1]:.5f}"
-    if cache_key in _route_cache:
-        _log(f"Cache hit for route: {cache_key}")
-        return _route_cache[cache_key]
-    
-    # OSRM expects lng,lat order in URL
-    coords = f"{start[1]},{start[0]};{end[1]},{end[0]}"
-    url = f"{OSRM_BASE_URL}/route/v1/{profile}/{coords}"
-    _log(f"Requesting: {url}")
-    
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                url,
-                params={
-                    "overview": "full",
-                    "geometries": "polyline"
-                }
-            )
-            
-            _log(f"Response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("code") == "Ok" and data.get("routes"):
-                    # Decode polyline to coordinates
-                    encoded = data["routes"][0]["geometry"]
-                    decoded = polyline.decode(encoded)
-                    # decoded is already in [lat, lng] format
-                    route_coords = [list(coord) for coord in decoded]
-                    _route_cache[cache_key] = route_coords
-                    _log(f"SUCCESS: Got {len(route_coords)} points following real roads")
-                    return route_coords
-                else:
-                    _log(f"OSRM returned no routes: {data.get('code')}")
-            else:
-                _log(f"OSRM API error: {response.status_code} - {response.text[:200]}")
-    except Exception as e:
-        _log(f"OSRM request failed: {e}")
-    
-    return None
+    return await _fetch_osrm_route([start, end], profile, timeout=10.0)
 
 
 async def get_multi_point_route_geometry(
@@ -91,47 +152,8 @@ async def get_multi_point_route_geometry(
         _log(f"Not enough waypoints: {len(waypoints)}")
         return None
     
-    # Create cache key
-    cache_key = "-".join([f"{p[0]:.5f},{p[1]:.5f}" for p in waypoints])
-    if cache_key in _route_cache:
-        _log(f"Cache hit for multi-point route ({len(waypoints)} waypoints)")
-        return _route_cache[cache_key]
-    
-    # OSRM expects lng,lat;lng,lat;... format
-    coords = ";".join([f"{p[1]},{p[0]}" for p in waypoints])
-    url = f"{OSRM_BASE_URL}/route/v1/{profile}/{coords}"
-    _log(f"Multi-point request ({len(waypoints)} waypoints): {url[:100]}...")
-    
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:  # Short timeout - fall back quickly
-            response = await client.get(
-                url,
-                params={
-                    "overview": "full",
-                    "geometries": "polyline"
-                }
-            )
-            
-            _log(f"Response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("code") == "Ok" and data.get("routes"):
-                    # Decode polyline to coordinates
-                    encoded = data["routes"][0]["geometry"]
-                    decoded = polyline.decode(encoded)
-                    route_coords = [list(coord) for coord in decoded]
-                    _route_cache[cache_key] = route_coords
-                    _log(f"SUCCESS: Got {len(route_coords)} points for {len(waypoints)} waypoints (following real roads)")
-                    return route_coords
-                else:
-                    _log(f"OSRM returned no routes: {data.get('code')}, message: {data.get('message', 'N/A')}")
-            else:
-                _log(f"OSRM API error: {response.status_code}")
-    except Exception as e:
-        _log(f"OSRM multi-point request failed: {e}")
-    
-    return None
+    # Short timeout - fall back quickly
+    return await _fetch_osrm_route(waypoints, profile, timeout=5.0)
 
 
 def interpolate_curved_path(
@@ -144,8 +166,6 @@ def interpolate_curved_path(
     Create a curved path between two points to simulate road-like routing.
     Uses quadratic bezier curve with a control point offset perpendicular to the line.
     """
-    import math
-    
     lat1, lng1 = start
     lat2, lng2 = end
     
@@ -172,16 +192,21 @@ def interpolate_curved_path(
     else:
         ctrl_lat, ctrl_lng = mid_lat, mid_lng
     
-    # Generate quadratic bezier curve points
-    points = []
-    for i in range(num_points + 1):
-        t = i / num_points
-        # Quadratic bezier formula: B(t) = (1-t)²P0 + 2(1-t)tP1 + t²P2
-        lat = (1-t)**2 * lat1 + 2*(1-t)*t * ctrl_lat + t**2 * lat2
-        lng = (1-t)**2 * lng1 + 2*(1-t)*t * ctrl_lng + t**2 * lng2
-        points.append([lat, lng])
+    # Generate quadratic bezier curve points for every t at once
+    t = np.arange(num_points + 1) / num_points
+    u = 1 - t
+    # Quadratic bezier formula: B(t) = (1-t)²P0 + 2(1-t)tP1 + t²P2
+    points = np.empty((num_points + 1, 2))
+    points[:, 0] = u**2 * lat1 + 2*u*t * ctrl_lat + t**2 * lat2
+    points[:, 1] = u**2 * lng1 + 2*u*t * ctrl_lng + t**2 * lng2
     
-    return points
+    return points.tolist()
+
+
+def _segment_points(start: Tuple[float, float], end: Tuple[float, float]) -> int:
+    """Number of interpolation points for a segment; longer segments get more"""
+    dist = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
+    return max(10, min(25, int(dist * 500)))  # Scale with distance
 
 
 def create_road_like_path(waypoints: List[Tuple[float, float]]) -> List[List[float]]:
@@ -192,21 +217,20 @@ def create_road_like_path(waypoints: List[Tuple[float, float]]) -> List[List[flo
     if len(waypoints) < 2:
         return [list(wp) for wp in waypoints]
     
-    all_points = []
-    for i in range(len(waypoints) - 1):
-        # Use more points for longer segments
-        start = waypoints[i]
-        end = waypoints[i + 1]
-        
-        # Calculate distance to determine number of interpolation points
-        import math
-        dist = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-        num_points = max(10, min(25, int(dist * 500)))  # Scale with distance
-        
-        segment = interpolate_curved_path(start, end, num_points)
-        if i > 0:
-            segment = segment[1:]  # Skip duplicate point
-        all_points.extend(segment)
+    if len(waypoints) == 2:
+        # Common point-to-point case: a single curved segment, no stitching
+        start, end = waypoints
+        all_points = interpolate_curved_path(start, end, _segment_points(start, end))
+    else:
+        all_points = []
+        for i in range(len(waypoints) - 1):
+            start = waypoints[i]
+            end = waypoints[i + 1]
+            
+            segment = interpolate_curved_path(start, end, _segment_points(start, end))
+            if i > 0:
+                segment = segment[1:]  # Skip duplicate point
+            all_points.extend(segment)
     
     _log(f"Created smooth path with {len(all_points)} points (curved fallback)")
     return all_points
@@ -235,8 +259,7 @@ async def get_route_with_fallback(
 
 def clear_cache():
     """Clear the route cache"""
-    global _route_cache
-    _route_cache = {}
+    _route_cache.clear()
 
 
 # touch update 11/29/2025 12:45:26
@@ -3,54 +3,185 @@ A* routing algorithm for ReliefRoute
 """
 import heapq
 import math
-from typing import List, Dict, Tuple, Optional, Set
-from .scenarios import ROAD_NETWORK
+from functools import lru_cache
+import numpy as np
+from typing import List, Dict, Tuple, Optional
+from .scenarios import (
+    ROAD_BIT, names_to_mask, NODE_ORDER, NODE_INDEX, ROAD_NAMES,
+    ADJ_INDPTR, ADJ_TO, ADJ_DIST, ADJ_TIME, ADJ_ROAD_ID, NODE_XY
+)
 
-def haversine_distance(coord1: List[float], coord2: List[float]) -> float:
-    """Calculate distance between two coordinates in km"""
-    R = 6371  # Earth's radius in km
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+def haversine_batch(lat1: float, lon1: float, lat_arr: np.ndarray, lon_arr: np.ndarray) -> np.ndarray:
+    """Distance in km from one point to many, all in radians, in a single numpy pass"""
+    a = np.sin((lat_arr - lat1) / 2)**2 + np.cos(lat_arr) * np.cos(lat1) * np.sin((lon_arr - lon1) / 2)**2
+    return 2 * 6371 * np.arcsin(np.sqrt(a))
+
+# Source node of each CSR edge, for walking came_from back to the start
+_EDGE_FROM = tuple(
+    node for node in range(len(NODE_ORDER))
+    for _ in range(ADJ_INDPTR[node], ADJ_INDPTR[node + 1])
+)
+
+# Node coordinates in radians, rows in NODE_ORDER
+NODE_COORDS_RAD = np.radians(NODE_XY)
+
+# All-pairs straight-line distance in km, one broadcast haversine at import
+NODE_DIST_KM = haversine_batch(
+    NODE_COORDS_RAD[:, :1], NODE_COORDS_RAD[:, 1:], NODE_COORDS_RAD[:, 0], NODE_COORDS_RAD[:, 1]
+)
+NODE_DIST_KM.flags.writeable = False  # rows are handed out without copying
+
+# Lowest cost per straight-line km over any edge (minutes for "time", road km for "distance").
+# Scaling straight-line distance by it never overestimates the remaining cost, so A* finds the
+# same optimum as the Dijkstra trees behind find_routes_to_zones
+_EDGE_STRAIGHT_KM = NODE_DIST_KM[list(_EDGE_FROM), list(ADJ_TO)]
+HEURISTIC_COST_PER_KM = {
+    "time": float((np.array(ADJ_TIME) / _EDGE_STRAIGHT_KM).min()),
+    "distance": float((np.array(ADJ_DIST) / _EDGE_STRAIGHT_KM).min()),
+}
+
+def haversine_all(node_idx: int) -> np.ndarray:
+    """Haversine distance in km from one node to every node, rows in NODE_ORDER"""
+    return NODE_DIST_KM[node_idx]
+
+def blocked_road_mask(blocked_roads: List[str]) -> int:
+    """Encode blocked road names as a bitmask over road ids (unknown roads are ignored)"""
+    return names_to_mask(blocked_roads, ROAD_BIT)
+
+def _a_star_core(
+    start_idx: int,
+    goal_idx: int,
+    indptr: Tuple[int, ...],
+    to_arr: Tuple[int, ...],
+    cost_arr: Tuple[float, ...],
+    road_ids: Tuple[int, ...],
+    blocked_mask: int,
+    h_arr: List[float]
+) -> Optional[Tuple[List[int], List[int]]]:
+    """
+    A* search over the integer CSR adjacency
+    Returns: (node indices, edge indices) along the path, or None if unreachable
+    """
+    n = len(indptr) - 1
+    g_scores = [math.inf] * n
+    came_from = [-1] * n  # edge used to reach each node
+    closed = [False] * n  # indexed by node; cheaper than hashing into a set
     
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
+    # Priority queue: (f_score, counter, node_idx); the counter breaks ties
+    # in insertion order, and paths are rebuilt from came_from at the goal
+    counter = 0
+    g_scores[start_idx] = 0
+    open_set = [(h_arr[start_idx], counter, start_idx)]
     
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        
+        if current == goal_idx:
+            return _reconstruct_path(came_from, start_idx, goal_idx)
+        
+        if closed[current]:
+            continue
+        
+        closed[current] = True
+        cost = g_scores[current]
+        
+        for e in range(indptr[current], indptr[current + 1]):
+            neighbor = to_arr[e]
+            if closed[neighbor] or (blocked_mask >> road_ids[e]) & 1:
+                continue
+            
+            # Calculate new cost
+            new_cost = cost + cost_arr[e]
+            
+            if new_cost < g_scores[neighbor]:
+                g_scores[neighbor] = new_cost
+                came_from[neighbor] = e
+                counter += 1
+                heapq.heappush(open_set, (new_cost + h_arr[neighbor], counter, neighbor))
     
-    return R * c
+    return None  # No path found
 
-def build_graph(blocked_roads: List[str] = None) -> Dict:
-    """Build adjacency list from road network, excluding blocked roads"""
-    if blocked_roads is None:
-        blocked_roads = []
+def _reconstruct_path(came_from: List[int], start_idx: int, goal_idx: int) -> Tuple[List[int], List[int]]:
+    """Walk came_from edges back from the goal to recover the path and edges used"""
+    current = goal_idx
+    path = [current]
+    edges = []
+    while current != start_idx:
+        e = came_from[current]
+        current = _EDGE_FROM[e]
+        path.append(current)
+        edges.append(e)
+    path.reverse()
+    edges.reverse()
+    return path, edges
+
+def dijkstra_single_source(
+    start: str,
+    blocked_roads: List[str] = None,
+    optimize_for: str = "time"
+) -> Tuple[List[float], List[int]]:
+    """
+    Shortest paths from start to every node in one pass
+    Returns: (cost per node index, incoming edge per node index; inf / -1 when unreachable)
+    """
+    start_idx = NODE_INDEX.get(start)
+    if start_idx is None:
+        n = len(NODE_ORDER)
+        return [math.inf] * n, [-1] * n
     
-    blocked_set = set(blocked_roads)
-    graph = {}
-    
-    # Initialize all nodes
-    for node_id in ROAD_NETWORK["nodes"]:
-        graph[node_id] = []
-    
-    # Add edges (bidirectional)
-    for edge in ROAD_NETWORK["edges"]:
-        if edge["road"] not in blocked_set:
-            # Forward edge
-            graph[edge["from"]].append({
-                "to": edge["to"],
-                "road": edge["road"],
-                "distance": edge["distance"],
-                "time": edge["time_min"]
-            })
-            # Backward edge
-            graph[edge["to"]].append({
-                "to": edge["from"],
-                "road": edge["road"],
-                "distance": edge["distance"],
-                "time": edge["time_min"]
-            })
-    
-    return graph
+    dist, came_from = _shortest_path_tree(start_idx, blocked_road_mask(blocked_roads or []), optimize_for)
+    return list(dist), list(came_from)
+
+@lru_cache(maxsize=1024)
+def _shortest_path_tree(start_idx: int, blocked_mask: int, optimize_for: str) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    """Dijkstra from one node, memoized per (start, blocked roads, optimize_for); ROAD_NETWORK is static"""
+    cost_arr = ADJ_TIME if optimize_for == "time" else ADJ_DIST
+    n = len(NODE_ORDER)
+    dist = [math.inf] * n
+    came_from = [-1] * n
+    
+    closed = [False] * n
+    counter = 0
+    dist[start_idx] = 0
+    open_set = [(0, counter, start_idx)]
+    
+    while open_set:
+        cost, _, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue
+        closed[current] = True
+        
+        for e in range(ADJ_INDPTR[current], ADJ_INDPTR[current + 1]):
+            neighbor = ADJ_TO[e]
+            if closed[neighbor] or (blocked_mask >> ADJ_ROAD_ID[e]) & 1:
+                continue
+            
+            new_cost = cost + cost_arr[e]
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                came_from[neighbor] = e
+                counter += 1
+                heapq.heappush(open_set, (new_cost, counter, neighbor))
+    
+    return tuple(dist), tuple(came_from)
+
+def _route_result(path: List[int], edges: List[int]) -> Dict:
+    """Translate node/edge indices from a search back into a route dict"""
+    # Calculate total distance and time
+    total_distance = 0
+    total_time = 0
+    for e in edges:
+        total_distance += ADJ_DIST[e]
+        total_time += ADJ_TIME[e]
+    
+    path_names = [NODE_ORDER[n] for n in path]
+    return {
+        "path": path_names,
+        "roads_used": [ROAD_NAMES[ADJ_ROAD_ID[e]] for e in edges],
+        "total_distance_km": round(total_distance, 2),
+        "total_time_min": round(total_time, 1),
+        "path_coordinates": NODE_XY[path].tolist()
+    }
 
 def a_star_route(
     start: str,
@@ -65,82 +196,52 @@ def a_star_route(
     if blocked_roads is None:
         blocked_roads = []
     
-    graph = build_graph(blocked_roads)
-    nodes = ROAD_NETWORK["nodes"]
-    
-    if start not in nodes or goal not in nodes:
+    route = _cached_a_star_route(start, goal, blocked_road_mask(blocked_roads), optimize_for)
+    if route is None:
         return None
     
-    goal_coord = nodes[goal]["coordinates"]
+    # Cached dicts are shared, so hand callers their own copies of the lists (and coordinate pairs)
+    route = {key: list(value) if isinstance(value, list) else value for key, value in route.items()}
+    route["path_coordinates"] = [list(pair) for pair in route["path_coordinates"]]
+    return route
+
+@lru_cache(maxsize=4096)
+def _cached_a_star_route(start: str, goal: str, blocked_mask: int, optimize_for: str) -> Optional[Dict]:
+    """A* route memoized per (start, goal, blocked roads, optimize_for); ROAD_NETWORK is static"""
+    if start not in NODE_INDEX or goal not in NODE_INDEX:
+        return None
     
-    def heuristic(node_id: str) -> float:
-        """Heuristic: straight-line distance to goal"""
-        node_coord = nodes[node_id]["coordinates"]
-        dist = haversine_distance(node_coord, goal_coord)
-        # Convert to time estimate (assuming 30 km/h average)
-        if optimize_for == "time":
-            return dist / 30 * 60  # minutes
-        return dist
+    edge_cost = ADJ_TIME if optimize_for == "time" else ADJ_DIST
+    start_idx = NODE_INDEX[start]
+    goal_idx = NODE_INDEX[goal]
     
-    # Priority queue: (f_score, node_id, path, total_cost, roads)
-    open_set = [(heuristic(start), start, [start], 0, [])]
-    closed_set: Set[str] = set()
-    g_scores = {start: 0}
+    # Heuristic: straight-line distance to goal, for every node at once, in cost units
+    h = haversine_all(goal_idx) * HEURISTIC_COST_PER_KM["time" if optimize_for == "time" else "distance"]
     
-    while open_set:
-        _, current, path, cost, roads = heapq.heappop(open_set)
-        
-        if current == goal:
-            # Calculate total distance and time
-            total_distance = 0
-            total_time = 0
-            for edge_info in roads:
-                total_distance += edge_info["distance"]
-                total_time += edge_info["time"]
-            
-            return {
-                "path": path,
-                "roads_used": [r["road"] for r in roads],
-                "total_distance_km": round(total_distance, 2),
-                "total_time_min": round(total_time, 1),
-                "path_coordinates": [nodes[n]["coordinates"] for n in path]
-            }
-        
-        if current in closed_set:
-            continue
-        
-        closed_set.add(current)
-        
-        for neighbor in graph.get(current, []):
-            if neighbor["to"] in closed_set:
-                continue
-            
-            # Calculate new cost
-            if optimize_for == "time":
-                new_cost = cost + neighbor["time"]
-            else:
-                new_cost = cost + neighbor["distance"]
-            
-            if neighbor["to"] not in g_scores or new_cost < g_scores[neighbor["to"]]:
-                g_scores[neighbor["to"]] = new_cost
-                f_score = new_cost + heuristic(neighbor["to"])
-                new_path = path + [neighbor["to"]]
-                new_roads = roads + [neighbor]
-                heapq.heappush(open_set, (f_score, neighbor["to"], new_path, new_cost, new_roads))
+    found = _a_star_core(start_idx, goal_idx, ADJ_INDPTR, ADJ_TO, edge_cost,
+                         ADJ_ROAD_ID, blocked_mask, h.tolist())
+    if found is None:
+        return None
     
-    return None  # No path found
+    return _route_result(*found)
 
 def find_routes_to_zones(
     start: str,
     zones: List[str],
     blocked_roads: List[str] = None
 ) -> Dict[str, Optional[Dict]]:
-    """Find routes from start to multiple zones"""
+    """Find routes from start to multiple zones with a single (cached) Dijkstra pass"""
+    start_idx = NODE_INDEX.get(start)
+    if start_idx is not None:
+        dist, came_from = _shortest_path_tree(start_idx, blocked_road_mask(blocked_roads or []), "time")
+    
     routes = {}
     for zone in zones:
-        zone_node = f"Zone_{zone}"
-        route = a_star_route(start, zone_node, blocked_roads)
-        routes[zone] = route
+        zone_idx = NODE_INDEX.get(f"Zone_{zone}")
+        if start_idx is None or zone_idx is None or dist[zone_idx] == math.inf:
+            routes[zone] = None
+        else:
+            routes[zone] = _route_result(*_reconstruct_path(came_from, start_idx, zone_idx))
     return routes
 
 def find_alternative_route(
@@ -1,6 +1,10 @@
 """
 Historical scenarios for Chennai - used for similarity matching
 """
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+import numpy as np
 
 CHENNAI_SCENARIOS = [
     # Flood scenarios
@@ -308,13 +312,132 @@ CHENNAI_SCENARIOS = [
     }
 ]
 
+# Fixed column schema for resources_deployed; resources a scenario did not deploy are 0
+RESOURCE_COLUMNS = ("medical_kits", "boats", "trucks", "drones", "helicopters",
+                    "water_liters", "cooling_units", "shelter_kits")
+RESOURCE_INDEX = {name: i for i, name in enumerate(RESOURCE_COLUMNS)}
+
+def build_resources_matrix(scenarios: List[Dict]) -> np.ndarray:
+    """Pack each scenario's resources_deployed into one int32 row (unknown resources are skipped)"""
+    matrix = np.zeros((len(scenarios), len(RESOURCE_COLUMNS)), dtype=np.int32)
+    for i, s in enumerate(scenarios):
+        for name, amount in s.get("resources_deployed", {}).items():
+            col = RESOURCE_INDEX.get(name)
+            if col is not None:
+                matrix[i, col] = amount
+    return matrix
+
+# Similarity features: severity, population, hospital load (0-1), zone count, blocked road count.
+# Each difference is divided by its scale and the weighted squares summed, as in the agent's metric
+SIMILARITY_SCALES = np.array([5.0, 100000.0, 1.0, 5.0, 5.0])
+SIMILARITY_WEIGHTS = np.array([2.0, 1.5, 1.8, 1.0, 1.2])
+
+# Disaster-specific term added for same-type matches:
+# (input key, historical field, default, scale); penalty is |current - historical| / scale * 0.3
+SPECIFIC_SIMILARITY = {
+    "flood": ("water_level_m", "flood_depth_m", 0.5, 1.0),
+    "cyclone": ("max_wind_speed_kmph", "wind_speed_kmh", 100, 200.0),
+    "heatwave": ("max_temp_c", "temperature_c", 45, 20.0),
+}
+
+def scenario_features(scenario: Dict) -> List[float]:
+    """Unscaled similarity features, accepting both input and historical field names"""
+    severity = int(scenario.get("severity_level", scenario.get("severity", 3)))
+    population = int(scenario.get("population_affected", 10000))
+    hospital = float(scenario.get("hospital_load_pct", scenario.get("hospital_load", 0.5)))
+    if hospital > 1:
+        hospital = hospital / 100.0
+    zones = scenario.get("zones_impacted", scenario.get("zones_affected", []))
+    return [severity, population, hospital, len(zones), len(scenario.get("blocked_roads", []))]
+
+def _specific_columns(scenarios: List[Dict], disaster_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-scenario (historical field, disaster_specific value) for one disaster type"""
+    key, field, default, _ = SPECIFIC_SIMILARITY[disaster_type]
+    fields = [s.get(field, default) for s in scenarios]
+    values = [
+        ((s.get("disaster_specific") or {}).get(disaster_type) or {}).get(key, fallback)
+        for s, fallback in zip(scenarios, fields)
+    ]
+    return np.array(fields, dtype=np.float64), np.array(values, dtype=np.float64)
+
+def build_type_index(scenarios: List[Dict]) -> Dict[str, np.ndarray]:
+    """Inverted index from disaster_type to the row indices of its scenarios"""
+    rows: Dict[str, List[int]] = {}
+    for i, s in enumerate(scenarios):
+        rows.setdefault(s.get("disaster_type"), []).append(i)
+    return {t: np.array(r, dtype=np.int32) for t, r in rows.items()}
+
+def build_similarity_table(scenarios: List[Dict]) -> Dict:
+    """Precompute the feature matrix and specific columns for a list of scenarios"""
+    return {
+        "scenarios": scenarios,
+        "type_index": build_type_index(scenarios),
+        "features": np.array([scenario_features(s) for s in scenarios], dtype=np.float64).reshape(-1, 5),
+        "specific": {t: _specific_columns(scenarios, t) for t in SPECIFIC_SIMILARITY},
+        "resources": build_resources_matrix(scenarios),
+    }
+
+def find_similar(query: Dict, k: int = 3, table: Dict = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest scenarios to query, restricted to its disaster type when any match
+    Returns: (row indices into table["scenarios"], distances), closest first
+    """
+    if table is None:
+        table = SIMILARITY_TABLE
+    disaster_type = query.get("disaster_type")
+    candidates = table["type_index"].get(disaster_type)
+    same_type = candidates is not None
+    if not same_type:
+        candidates = np.arange(len(table["scenarios"]))  # Fall back to all scenarios
+    
+    diff = np.abs(table["features"][candidates] - np.array(scenario_features(query))) / SIMILARITY_SCALES
+    distances = np.sqrt((SIMILARITY_WEIGHTS * diff ** 2).sum(axis=1))
+    
+    if same_type and disaster_type in SPECIFIC_SIMILARITY:
+        key, _, _, scale = SPECIFIC_SIMILARITY[disaster_type]
+        fields, values = table["specific"][disaster_type]
+        current = (query.get("disaster_specific") or {}).get(disaster_type) or {}
+        # Without a current value the historical field stands in, as in the per-pair metric
+        current_values = current[key] if key in current else fields[candidates]
+        distances = distances + np.abs(current_values - values[candidates]) / scale * 0.3
+    
+    # Rank on the rounded distance (stable), matching the reported precision
+    distances = np.round(distances, 3)
+    order = np.argsort(distances, kind="stable")[:k]
+    return candidates[order], distances[order]
+
+SIMILARITY_TABLE = build_similarity_table(CHENNAI_SCENARIOS)
+
+def average_resources(indices: List[int], table: Dict = None) -> Dict[str, float]:
+    """Mean deployed amount of every resource over the given table rows"""
+    if table is None:
+        table = SIMILARITY_TABLE
+    return dict(zip(RESOURCE_COLUMNS, table["resources"][indices].mean(axis=0).tolist()))
+
+# Satellite depots stock the same read-only resource and vehicle templates (shared, not copied)
+_SMALL_DEPOT_RESOURCES = MappingProxyType({
+    "medical_kits": 5000,
+    "food_packets": 25000,
+    "water_liters": 250000,
+    "shelter_kits": 1000,
+    "oxygen_cylinders": 200,
+    "vaccines": 2000,
+    "surgical_kits": 100
+})
+_SMALL_DEPOT_VEHICLES = MappingProxyType({
+    "trucks": 10,
+    "boats": 4,
+    "drones": 5,
+    "helicopters": 1
+})
+
 # Initial inventory at depots
 DEPOT_INVENTORY = {
     "central_depot": {
         "name": "Central Depot",
         "location": "Chennai Central",
         "coordinates": [13.0827, 80.2707],
-        "resources": {
+        "resources": MappingProxyType({
             "medical_kits": 10000,
             "food_packets": 50000,
             "water_liters": 500000,
@@ -322,53 +445,27 @@ DEPOT_INVENTORY = {
             "oxygen_cylinders": 500,
             "vaccines": 5000,
             "surgical_kits": 200
-        },
-        "vehicles": {
+        }),
+        "vehicles": MappingProxyType({
             "trucks": 20,
             "boats": 8,
             "drones": 10,
             "helicopters": 2
-        }
+        })
     },
     "north_depot": {
         "name": "North Depot",
         "location": "Ambattur",
         "coordinates": [13.1143, 80.1548],
-        "resources": {
-            "medical_kits": 5000,
-            "food_packets": 25000,
-            "water_liters": 250000,
-            "shelter_kits": 1000,
-            "oxygen_cylinders": 200,
-            "vaccines": 2000,
-            "surgical_kits": 100
-        },
-        "vehicles": {
-            "trucks": 10,
-            "boats": 4,
-            "drones": 5,
-            "helicopters": 1
-        }
+        "resources": _SMALL_DEPOT_RESOURCES,
+        "vehicles": _SMALL_DEPOT_VEHICLES
     },
     "south_depot": {
         "name": "South Depot",
         "location": "Tambaram",
         "coordinates": [12.9249, 80.1000],
-        "resources": {
-            "medical_kits": 5000,
-            "food_packets": 25000,
-            "water_liters": 250000,
-            "shelter_kits": 1000,
-            "oxygen_cylinders": 200,
-            "vaccines": 2000,
-            "surgical_kits": 100
-        },
-        "vehicles": {
-            "trucks": 10,
-            "boats": 4,
-            "drones": 5,
-            "helicopters": 1
-        }
+        "resources": _SMALL_DEPOT_RESOURCES,
+        "vehicles": _SMALL_DEPOT_VEHICLES
     }
 }
 
@@ -411,6 +508,17 @@ ZONES = {
     }
 }
 
+def _depot_totals() -> MappingProxyType:
+    """Resources and vehicles summed across all depots, read-only"""
+    totals: Dict[str, int] = {}
+    for depot in DEPOT_INVENTORY.values():
+        for group in ("resources", "vehicles"):
+            for key, amount in depot[group].items():
+                totals[key] = totals.get(key, 0) + amount
+    return MappingProxyType(totals)
+
+DEPOT_TOTALS = _depot_totals()
+
 # Road network for A* routing
 ROAD_NETWORK = {
     "nodes": {
@@ -465,4 +573,59 @@ ROAD_NETWORK = {
 }
 
 
+def _intern_names():
+    """Intern the zone/road/type names repeated across the tables and freeze name lists into tuples"""
+    for s in CHENNAI_SCENARIOS:
+        s["disaster_type"] = sys.intern(s["disaster_type"])
+        s["zones_affected"] = tuple(sys.intern(z) for z in s["zones_affected"])
+        s["blocked_roads"] = tuple(sys.intern(r) for r in s["blocked_roads"])
+    for edge in ROAD_NETWORK["edges"]:
+        for key in ("from", "to", "road"):
+            edge[key] = sys.intern(edge[key])
+
+_intern_names()
+
+def _build_adjacency():
+    """Flatten ROAD_NETWORK into integer-indexed CSR adjacency (tuples index fastest from Python)"""
+    node_order = tuple(ROAD_NETWORK["nodes"])
+    node_index = {node_id: i for i, node_id in enumerate(node_order)}
+    road_names = tuple(dict.fromkeys(edge["road"] for edge in ROAD_NETWORK["edges"]))
+    road_id = {road: i for i, road in enumerate(road_names)}
+    
+    # Edges in network order, both directions, so A* breaks ties as the old dict graph did
+    neighbors = [[] for _ in node_order]
+    for edge in ROAD_NETWORK["edges"]:
+        rid = road_id[edge["road"]]
+        neighbors[node_index[edge["from"]]].append((node_index[edge["to"]], edge["distance"], edge["time_min"], rid))
+        neighbors[node_index[edge["to"]]].append((node_index[edge["from"]], edge["distance"], edge["time_min"], rid))
+    
+    indptr = [0]
+    for adj in neighbors:
+        indptr.append(indptr[-1] + len(adj))
+    flat = [entry for adj in neighbors for entry in adj]
+    
+    return (
+        node_order, node_index, road_names, road_id, tuple(indptr),
+        tuple(e[0] for e in flat), tuple(e[1] for e in flat),
+        tuple(e[2] for e in flat), tuple(e[3] for e in flat)
+    )
+
+# Precomputed once at import; edge e of node n lies in ADJ_INDPTR[n]:ADJ_INDPTR[n + 1]
+(NODE_ORDER, NODE_INDEX, ROAD_NAMES, ROAD_ID, ADJ_INDPTR,
+ ADJ_TO, ADJ_DIST, ADJ_TIME, ADJ_ROAD_ID) = _build_adjacency()
+
+# Node [lat, lon] in degrees, rows in NODE_ORDER
+NODE_XY = np.array([ROAD_NETWORK["nodes"][node_id]["coordinates"] for node_id in NODE_ORDER], dtype=np.float64)
+
+# Bit per road name, so blocked-road sets compare as integer masks
+ROAD_BIT = {road: 1 << i for i, road in enumerate(ROAD_NAMES)}
+
+def names_to_mask(names: List[str], bits: Dict[str, int]) -> int:
+    """OR together the bits of the given names (unknown names are ignored)"""
+    mask = 0
+    for name in names:
+        mask |= bits.get(name, 0)
+    return mask
+
+
 # touch update 11/29/2025 12:45:26
@@ -2,46 +2,64 @@
 Generate extended training data for high accuracy ML models
 Creates 200+ diverse scenarios for >96% model accuracy
 """
-import json
 import os
-import random
+import sys
 import math
 
+from scenario_io import (
+    rng as _rng, write_scenarios, write_scenarios_ndjson, count_scenario_files, profile_main
+)
+
+_uniform = _rng.uniform
+_randint = _rng.randint
+_sample = _rng.sample
+
+SEVERITY_LABELS = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
+
+# Base population multiplier per severity
+BASE_MULTIPLIERS = {1: 1.0, 2: 1.5, 3: 2.0, 4: 3.0, 5: 4.5}
+
+# Severity-only terms of the scenario formulas, computed once instead of per call.
+# Each keeps the left-to-right evaluation of the original expression, so results are unchanged
+BASE_POP = {s: 5000 * m for s, m in BASE_MULTIPLIERS.items()}
+BASE_LOAD = {s: 25 + s * 14 for s in SEVERITY_LABELS}
+BASE_ZONES = {s: (s + 1) // 2 for s in SEVERITY_LABELS}
+BASE_BLOCKED = {s: s - 2 for s in SEVERITY_LABELS}
+SEVERITY_FACTORS = {s: s / 3.0 for s in SEVERITY_LABELS}
+BASE_RESPONSE = {s: 15 + s * 10 for s in SEVERITY_LABELS}
+
+ALL_ZONES = ("East", "West", "North", "South", "Central")
+ALL_ROADS = ("OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road", "Velachery Road")
+
 def generate_scenario(disaster_type, severity, variation_idx, specific_params):
     """Generate a scenario with specific parameters"""
-    severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
-    
     # Base population scales with severity
-    base_multipliers = {1: 1.0, 2: 1.5, 3: 2.0, 4: 3.0, 5: 4.5}
-    base_pop = int(5000 * base_multipliers[severity] * (1 + random.uniform(-0.2, 0.3)))
+    base_pop = int(BASE_POP[severity] * (1 + _uniform(-0.2, 0.3)))
     
     # Hospital load increases with severity
-    base_load = 25 + severity * 14 + random.randint(-4, 8)
+    base_load = BASE_LOAD[severity] + _randint(-4, 8)
     hospital_load = min(99, max(20, base_load))
     
     # Zones based on severity
-    all_zones = ["East", "West", "North", "South", "Central"]
-    num_zones = min(len(all_zones), max(1, (severity + 1) // 2 + random.randint(0, 2)))
-    zones = random.sample(all_zones, num_zones)
+    num_zones = min(len(ALL_ZONES), max(1, BASE_ZONES[severity] + _randint(0, 2)))
+    zones = _sample(ALL_ZONES, num_zones)
     
     # Blocked roads
-    all_roads = ["OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road", "Velachery Road"]
-    num_blocked = min(len(all_roads), max(0, severity - 2 + random.randint(-1, 2)))
-    blocked = random.sample(all_roads, num_blocked) if num_blocked > 0 else []
+    num_blocked = min(len(ALL_ROADS), max(0, BASE_BLOCKED[severity] + _randint(-1, 2)))
+    blocked = _sample(ALL_ROADS, num_blocked) if num_blocked > 0 else []
     
     # Resource calculations with strong correlation to severity and population
-    pop_factor = base_pop / 10000
-    severity_factor = severity / 3.0
+    severity_factor = SEVERITY_FACTORS[severity]
     
     # Medical kits: ~8% of population, scaled by severity
-    medical_kits = int(base_pop * 0.08 * severity_factor * (1 + random.uniform(-0.1, 0.15)))
-    food_packets = int(base_pop * 0.2 * (1 + random.uniform(-0.1, 0.1)))
-    water_liters = int(base_pop * 3 * (1 + random.uniform(-0.1, 0.15)))
-    shelter_kits = int(base_pop * 0.01 * severity_factor * (1 + random.uniform(-0.1, 0.15)))
+    medical_kits = int(base_pop * 0.08 * severity_factor * (1 + _uniform(-0.1, 0.15)))
+    food_packets = int(base_pop * 0.2 * (1 + _uniform(-0.1, 0.1)))
+    water_liters = int(base_pop * 3 * (1 + _uniform(-0.1, 0.15)))
+    shelter_kits = int(base_pop * 0.01 * severity_factor * (1 + _uniform(-0.1, 0.15)))
     
     # Vehicles based on zones and severity
-    trucks = max(2, int(len(zones) * 2 + severity + random.randint(-1, 2)))
-    drones = max(1, int(len(zones) + random.randint(0, 2)))
+    trucks = max(2, int(len(zones) * 2 + severity + _randint(-1, 2)))
+    drones = max(1, int(len(zones) + _randint(0, 2)))
     
     scenario_id = f"{disaster_type}_{specific_params.get('subtype', 'v')}_{severity}_{variation_idx}"
     
@@ -51,11 +69,11 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
         "city": "Chennai",
         "severity": severity,
         "severity_level": severity,
-        "severity_label": severity_labels[severity],
+        "severity_label": SEVERITY_LABELS[severity],
         "population_affected": max(1000, base_pop),
         "zones_affected": zones,
         "zones_impacted": zones,
-        "hospital_load": round(hospital_load / 100, 2),
+        "hospital_load": hospital_load / 100,  # integer percent, so already exact to 2 places
         "hospital_load_pct": hospital_load,
         "blocked_roads": blocked,
         "resources_deployed": {
@@ -67,7 +85,7 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
             "shelter_kits": max(20, shelter_kits)
         },
         "outcome": "successful",
-        "response_time_min": 15 + severity * 10 + random.randint(-5, 15)
+        "response_time_min": BASE_RESPONSE[severity] + _randint(-5, 15)
     }
     
     # Add disaster-specific data
@@ -78,16 +96,16 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
         
         base_scenario["disaster_specific"] = {
             "flood": {
-                "water_level_m": round(water_level + random.uniform(-0.1, 0.15), 2),
-                "rainfall_mm_24h": int(rainfall + random.randint(-20, 30)),
+                "water_level_m": round(water_level + _uniform(-0.1, 0.15), 2),
+                "rainfall_mm_24h": int(rainfall + _randint(-20, 30)),
                 "inland_or_coastal": location
             }
         }
-        boats = max(0, int(severity * 2 + len(zones) + random.randint(-1, 2))) if location == "coastal" or water_level > 0.8 else 0
-        helicopters = random.randint(1, 3) if severity >= 4 and water_level > 1.2 else 0
+        boats = max(0, int(severity * 2 + len(zones) + _randint(-1, 2))) if location == "coastal" or water_level > 0.8 else 0
+        helicopters = _randint(1, 3) if severity >= 4 and water_level > 1.2 else 0
         base_scenario["resources_deployed"]["boats"] = boats
         base_scenario["resources_deployed"]["helicopters"] = helicopters
-        base_scenario["notes"] = f"{severity_labels[severity]} {location} flood"
+        base_scenario["notes"] = f"{SEVERITY_LABELS[severity]} {location} flood"
         
     elif disaster_type == "cyclone":
         wind_speed = specific_params.get("wind_speed", 50 + severity * 35)
@@ -96,16 +114,16 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
         
         base_scenario["disaster_specific"] = {
             "cyclone": {
-                "max_wind_speed_kmph": int(wind_speed + random.randint(-10, 15)),
-                "cyclone_translation_speed_kmph": int(translation + random.randint(-3, 5)),
+                "max_wind_speed_kmph": int(wind_speed + _randint(-10, 15)),
+                "cyclone_translation_speed_kmph": int(translation + _randint(-3, 5)),
                 "cyclone_direction": direction
             }
         }
-        boats = max(0, int(severity + len(zones) + random.randint(-1, 2)))
-        helicopters = random.randint(1, 4) if severity >= 3 else 0
+        boats = max(0, int(severity + len(zones) + _randint(-1, 2)))
+        helicopters = _randint(1, 4) if severity >= 3 else 0
         base_scenario["resources_deployed"]["boats"] = boats
         base_scenario["resources_deployed"]["helicopters"] = helicopters
-        base_scenario["notes"] = f"{severity_labels[severity]} cyclone moving {direction}"
+        base_scenario["notes"] = f"{SEVERITY_LABELS[severity]} cyclone moving {direction}"
         
     elif disaster_type == "earthquake":
         magnitude = specific_params.get("magnitude", 3.5 + severity * 0.85)
@@ -114,18 +132,18 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
         
         base_scenario["disaster_specific"] = {
             "earthquake": {
-                "magnitude": round(magnitude + random.uniform(-0.2, 0.3), 1),
-                "epicenter_distance_km": int(distance + random.randint(-10, 15)),
-                "building_collapse_ratio": round(min(0.5, max(0.01, collapse + random.uniform(-0.02, 0.03))), 2)
+                "magnitude": round(magnitude + _uniform(-0.2, 0.3), 1),
+                "epicenter_distance_km": int(distance + _randint(-10, 15)),
+                "building_collapse_ratio": round(min(0.5, max(0.01, collapse + _uniform(-0.02, 0.03))), 2)
             }
         }
         # More trucks and drones for search and rescue
-        base_scenario["resources_deployed"]["trucks"] = max(4, int(len(zones) * 3 + severity + random.randint(-1, 3)))
-        base_scenario["resources_deployed"]["drones"] = max(2, int(len(zones) * 2 + random.randint(0, 3)))
+        base_scenario["resources_deployed"]["trucks"] = max(4, int(len(zones) * 3 + severity + _randint(-1, 3)))
+        base_scenario["resources_deployed"]["drones"] = max(2, int(len(zones) * 2 + _randint(0, 3)))
         base_scenario["resources_deployed"]["boats"] = 0
-        helicopters = random.randint(1, 5) if severity >= 4 or collapse > 0.15 else 0
+        helicopters = _randint(1, 5) if severity >= 4 or collapse > 0.15 else 0
         base_scenario["resources_deployed"]["helicopters"] = helicopters
-        base_scenario["notes"] = f"{severity_labels[severity]} earthquake M{round(magnitude, 1)}"
+        base_scenario["notes"] = f"{SEVERITY_LABELS[severity]} earthquake M{round(magnitude, 1)}"
         
     elif disaster_type == "heatwave":
         temperature = specific_params.get("temperature", 37 + severity * 3)
@@ -134,28 +152,29 @@ def generate_scenario(disaster_type, severity, variation_idx, specific_params):
         
         base_scenario["disaster_specific"] = {
             "heatwave": {
-                "max_temp_c": int(temperature + random.randint(-1, 3)),
-                "humidity_pct": int(humidity + random.randint(-5, 8)),
-                "duration_days": max(1, int(duration + random.randint(-1, 2)))
+                "max_temp_c": int(temperature + _randint(-1, 3)),
+                "humidity_pct": int(humidity + _randint(-5, 8)),
+                "duration_days": max(1, int(duration + _randint(-1, 2)))
             }
         }
         # More water for heatwaves
-        base_scenario["resources_deployed"]["water_liters"] = int(base_pop * 5 * (1 + random.uniform(-0.1, 0.15)))
+        base_scenario["resources_deployed"]["water_liters"] = int(base_pop * 5 * (1 + _uniform(-0.1, 0.15)))
         base_scenario["resources_deployed"]["boats"] = 0
         base_scenario["resources_deployed"]["helicopters"] = 0
         base_scenario["blocked_roads"] = []  # Roads not blocked in heatwaves
-        base_scenario["notes"] = f"{severity_labels[severity]} heatwave {int(temperature)}°C"
+        base_scenario["notes"] = f"{SEVERITY_LABELS[severity]} heatwave {int(temperature)}°C"
     
     return base_scenario
 
 def main():
     """Generate extended training dataset"""
-    random.seed(123)  # For reproducibility
+    _rng.seed(123)  # For reproducibility
     
     scenarios_dir = os.path.join(os.path.dirname(__file__), 'app', 'data', 'scenarios')
     os.makedirs(scenarios_dir, exist_ok=True)
     
-    generated_count = 0
+    # Build every scenario in memory first, then write them in one pass
+    scenarios = []
     
     print("Generating extended training data for high accuracy...")
     
@@ -182,10 +201,7 @@ def main():
                 "water_level": config["water_level"],
                 "rainfall": config["rainfall"]
             })
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # CYCLONE scenarios (50 variations)
     print("📊 Generating CYCLONE scenarios...")
@@ -210,10 +226,7 @@ def main():
                 "wind_speed": config["wind_speed"],
                 "translation": config["translation"]
             })
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # EARTHQUAKE scenarios (50 variations)
     print("📊 Generating EARTHQUAKE scenarios...")
@@ -238,10 +251,7 @@ def main():
                 "distance": config["distance"],
                 "collapse": config["collapse"]
             })
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # HEATWAVE scenarios (50 variations)
     print("📊 Generating HEATWAVE scenarios...")
@@ -266,29 +276,39 @@ def main():
                 "humidity": config["humidity"],
                 "duration": config["duration"]
             })
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
-    print(f"\n✅ Generated {generated_count} additional training scenarios")
+    # --ndjson writes one extended_scenarios.ndjson instead of a file per scenario;
+    # each mode removes the other's output so no scenario is on disk twice
+    ndjson_path = os.path.join(scenarios_dir, "extended_scenarios.ndjson")
+    if "--ndjson" in sys.argv:
+        write_scenarios_ndjson(scenarios, ndjson_path)
+    else:
+        if os.path.exists(ndjson_path):
+            os.remove(ndjson_path)
+        # Compact JSON by default; --pretty indents the files for reading by hand,
+        # --force rewrites files even when their contents are unchanged
+        written = write_scenarios(scenarios, scenarios_dir, pretty="--pretty" in sys.argv,
+                                  force="--force" in sys.argv)
+        if written < len(scenarios):
+            print(f"   {len(scenarios) - written} unchanged files left as they were")
+    print(f"\n✅ Generated {len(scenarios)} additional training scenarios")
     
     # Count all scenarios
-    all_files = [f for f in os.listdir(scenarios_dir) if f.endswith('.json')]
-    print(f"\n📊 Total scenario files: {len(all_files)}")
-    
-    flood_count = len([f for f in all_files if 'flood' in f.lower()])
-    cyclone_count = len([f for f in all_files if 'cyclone' in f.lower()])
-    earthquake_count = len([f for f in all_files if 'earthquake' in f.lower()])
-    heatwave_count = len([f for f in all_files if 'heatwave' in f.lower()])
+    total_files, counts = count_scenario_files(scenarios_dir)
+    print(f"\n📊 Total scenario files: {total_files}")
     
-    print(f"\n   Flood scenarios: {flood_count}")
-    print(f"   Cyclone scenarios: {cyclone_count}")
-    print(f"   Earthquake scenarios: {earthquake_count}")
-    print(f"   Heatwave scenarios: {heatwave_count}")
+    print(f"\n   Flood scenarios: {counts['flood']}")
+    print(f"   Cyclone scenarios: {counts['cyclone']}")
+    print(f"   Earthquake scenarios: {counts['earthquake']}")
+    print(f"   Heatwave scenarios: {counts['heatwave']}")
 
 if __name__ == "__main__":
-    main()
+    # --profile shows whether encoding, random draws or file writes dominate a run
+    if "--profile" in sys.argv:
+        profile_main(main)
+    else:
+        main()
 
 
 # touch update 11/29/2025 12:45:26
@@ -2,70 +2,110 @@
 Generate comprehensive training data for ML models
 Creates 50+ diverse scenarios for better model accuracy
 """
-import json
 import os
-import random
+import sys
 import math
 
+from scenario_io import (
+    rng as _rng, write_scenarios, write_scenarios_ndjson, count_scenario_files, profile_main
+)
+
+_uniform = _rng.uniform
+_randint = _rng.randint
+_sample = _rng.sample
+
+SEVERITY_LABELS = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
+
+ALL_ZONES = ("East", "West", "North", "South", "Central")
+
+# Roads that can be blocked, per disaster type (heatwaves block none)
+FLOOD_ROADS = ("OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road", "Velachery Road")
+CYCLONE_ROADS = ("OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road")
+EARTHQUAKE_ROADS = ("Anna Salai", "Mount Road", "GST Road", "OMR", "ECR")
+
+# Epicenter distance (km) and humidity (%) ranges per category
+DISTANCE_RANGES = {"near": (10, 30), "medium": (30, 60), "far": (60, 100)}
+HUMIDITY_RANGES = {"low": (10, 25), "medium": (25, 45), "high": (45, 70)}
+
+def _population(severity, base_range, jitter_range):
+    """Affected population: a per-severity base plus jitter"""
+    base_pop = _randint(*base_range) * severity
+    return base_pop + _randint(*jitter_range)
+
+def _hospital_load(severity, base, per_severity, jitter_range, floor):
+    """Hospital load percentage, rising with severity and clamped to [floor, 99]"""
+    base_load = base + severity * per_severity + _randint(*jitter_range)
+    return min(99, max(floor, base_load))
+
+def _pick_zones(count):
+    """Sample between 1 and all zones"""
+    return _sample(ALL_ZONES, min(len(ALL_ZONES), max(1, count)))
+
+def _pick_blocked(roads, count):
+    """Sample up to len(roads) blocked roads (none when count <= 0)"""
+    num_blocked = min(len(roads), max(0, count))
+    return _sample(roads, num_blocked) if num_blocked > 0 else []
+
+def _scenario_record(scenario_id, disaster_type, severity, population, zones, hospital_load,
+                     blocked, specific, resources, response_time, notes):
+    """Assemble the scenario dict shared by every disaster type"""
+    return {
+        "id": scenario_id,
+        "disaster_type": disaster_type,
+        "city": "Chennai",
+        "severity": severity,
+        "severity_level": severity,
+        "severity_label": SEVERITY_LABELS[severity],
+        "population_affected": population,
+        "zones_affected": zones,
+        "zones_impacted": zones,
+        "hospital_load": hospital_load / 100,  # integer percent, so already exact to 2 places
+        "hospital_load_pct": hospital_load,
+        "blocked_roads": blocked,
+        "disaster_specific": {disaster_type: specific},
+        "resources_deployed": resources,
+        "outcome": "successful",
+        "response_time_min": response_time,
+        "notes": notes
+    }
+
 def generate_flood_scenario(idx, severity, is_coastal):
     """Generate a flood scenario"""
-    severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
-    
     # Population scales with severity
-    base_pop = random.randint(5000, 15000) * severity
-    population = base_pop + random.randint(-2000, 5000)
+    population = _population(severity, (5000, 15000), (-2000, 5000))
     
     # Hospital load increases with severity
-    base_load = 30 + severity * 12 + random.randint(-5, 10)
-    hospital_load = min(99, max(20, base_load))
+    hospital_load = _hospital_load(severity, 30, 12, (-5, 10), 20)
     
     # Water level and rainfall based on severity
-    water_level = round(0.2 + severity * 0.4 + random.uniform(-0.1, 0.2), 2)
-    rainfall = 50 + severity * 60 + random.randint(-20, 40)
-    
-    # Zones based on severity
-    all_zones = ["East", "West", "North", "South", "Central"]
-    num_zones = min(len(all_zones), max(1, severity - 1 + random.randint(0, 2)))
-    zones = random.sample(all_zones, num_zones)
+    water_level = round(0.2 + severity * 0.4 + _uniform(-0.1, 0.2), 2)
+    rainfall = 50 + severity * 60 + _randint(-20, 40)
     
-    # Blocked roads based on severity
-    all_roads = ["OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road", "Velachery Road"]
-    num_blocked = min(len(all_roads), max(0, severity - 2 + random.randint(0, 2)))
-    blocked = random.sample(all_roads, num_blocked) if num_blocked > 0 else []
+    # Zones and blocked roads based on severity
+    zones = _pick_zones(severity - 1 + _randint(0, 2))
+    blocked = _pick_blocked(FLOOD_ROADS, severity - 2 + _randint(0, 2))
     
     # Resources based on population and severity
-    medical_kits = int(population * 0.08 * (severity / 3.0) + random.randint(-100, 200))
-    food_packets = int(population * 0.2 + random.randint(-500, 500))
-    water_liters = int(population * 3 + random.randint(-5000, 10000))
-    shelter_kits = int(population * 0.01 + random.randint(-20, 50))
-    boats = max(0, int(severity * 2 + len(zones) + random.randint(-1, 3)))
-    trucks = max(2, int(len(zones) * 3 + random.randint(-2, 4)))
-    drones = max(1, int(len(zones) + random.randint(0, 3)))
-    helicopters = 0 if severity < 4 else random.randint(1, 3)
+    medical_kits = int(population * 0.08 * (severity / 3.0) + _randint(-100, 200))
+    food_packets = int(population * 0.2 + _randint(-500, 500))
+    water_liters = int(population * 3 + _randint(-5000, 10000))
+    shelter_kits = int(population * 0.01 + _randint(-20, 50))
+    boats = max(0, int(severity * 2 + len(zones) + _randint(-1, 3)))
+    trucks = max(2, int(len(zones) * 3 + _randint(-2, 4)))
+    drones = max(1, int(len(zones) + _randint(0, 3)))
+    helicopters = 0 if severity < 4 else _randint(1, 3)
     
     location = "coastal" if is_coastal else "inland"
     
-    return {
-        "id": f"flood_{location}_{severity}_{idx}",
-        "disaster_type": "flood",
-        "city": "Chennai",
-        "severity": severity,
-        "severity_level": severity,
-        "severity_label": severity_labels[severity],
-        "population_affected": max(1000, population),
-        "zones_affected": zones,
-        "zones_impacted": zones,
-        "hospital_load": round(hospital_load / 100, 2),
-        "hospital_load_pct": hospital_load,
-        "blocked_roads": blocked,
-        "disaster_specific": {
-            "flood": {
-                "water_level_m": max(0.1, water_level),
-                "rainfall_mm_24h": max(50, rainfall),
-                "inland_or_coastal": location
-            }
+    return _scenario_record(
+        f"flood_{location}_{severity}_{idx}", "flood", severity, max(1000, population),
+        zones, hospital_load, blocked,
+        {
+            "water_level_m": max(0.1, water_level),
+            "rainfall_mm_24h": max(50, rainfall),
+            "inland_or_coastal": location
         },
-        "resources_deployed": {
+        {
             "medical_kits": max(100, medical_kits),
             "boats": max(0, boats),
             "trucks": max(2, trucks),
@@ -75,62 +115,39 @@ def generate_flood_scenario(idx, severity, is_coastal):
             "water_liters": max(5000, water_liters),
             "shelter_kits": max(50, shelter_kits)
         },
-        "outcome": "successful",
-        "response_time_min": 20 + severity * 10 + random.randint(-5, 15),
-        "notes": f"{severity_labels[severity]} {location} flood scenario"
-    }
+        20 + severity * 10 + _randint(-5, 15),
+        f"{SEVERITY_LABELS[severity]} {location} flood scenario"
+    )
 
 def generate_cyclone_scenario(idx, severity, direction):
     """Generate a cyclone scenario"""
-    severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
-    
-    base_pop = random.randint(8000, 20000) * severity
-    population = base_pop + random.randint(-3000, 8000)
-    
-    base_load = 35 + severity * 13 + random.randint(-5, 10)
-    hospital_load = min(99, max(25, base_load))
-    
-    wind_speed = 60 + severity * 35 + random.randint(-15, 25)
-    translation_speed = 12 + random.randint(0, 18)
-    
-    all_zones = ["East", "West", "North", "South", "Central"]
-    num_zones = min(len(all_zones), max(1, severity - 1 + random.randint(0, 2)))
-    zones = random.sample(all_zones, num_zones)
-    
-    all_roads = ["OMR", "ECR", "Marina", "Anna Salai", "Mount Road", "GST Road"]
-    num_blocked = min(len(all_roads), max(0, severity - 1 + random.randint(0, 2)))
-    blocked = random.sample(all_roads, num_blocked) if num_blocked > 0 else []
-    
-    medical_kits = int(population * 0.08 * (severity / 3.0) + random.randint(-150, 250))
-    food_packets = int(population * 0.2 + random.randint(-600, 600))
-    water_liters = int(population * 3 + random.randint(-6000, 12000))
-    shelter_kits = int(population * 0.01 + random.randint(-25, 60))
-    boats = max(0, int(severity + len(zones) + random.randint(-1, 2)))
-    trucks = max(3, int(len(zones) * 4 + random.randint(-2, 5)))
-    drones = max(1, int(len(zones) + severity + random.randint(0, 4)))
-    helicopters = 0 if severity < 3 else random.randint(1, 4)
-    
-    return {
-        "id": f"cyclone_{direction.lower()}_{severity}_{idx}",
-        "disaster_type": "cyclone",
-        "city": "Chennai",
-        "severity": severity,
-        "severity_level": severity,
-        "severity_label": severity_labels[severity],
-        "population_affected": max(2000, population),
-        "zones_affected": zones,
-        "zones_impacted": zones,
-        "hospital_load": round(hospital_load / 100, 2),
-        "hospital_load_pct": hospital_load,
-        "blocked_roads": blocked,
-        "disaster_specific": {
-            "cyclone": {
-                "max_wind_speed_kmph": max(60, wind_speed),
-                "cyclone_translation_speed_kmph": translation_speed,
-                "cyclone_direction": direction
-            }
+    population = _population(severity, (8000, 20000), (-3000, 8000))
+    hospital_load = _hospital_load(severity, 35, 13, (-5, 10), 25)
+    
+    wind_speed = 60 + severity * 35 + _randint(-15, 25)
+    translation_speed = 12 + _randint(0, 18)
+    
+    zones = _pick_zones(severity - 1 + _randint(0, 2))
+    blocked = _pick_blocked(CYCLONE_ROADS, severity - 1 + _randint(0, 2))
+    
+    medical_kits = int(population * 0.08 * (severity / 3.0) + _randint(-150, 250))
+    food_packets = int(population * 0.2 + _randint(-600, 600))
+    water_liters = int(population * 3 + _randint(-6000, 12000))
+    shelter_kits = int(population * 0.01 + _randint(-25, 60))
+    boats = max(0, int(severity + len(zones) + _randint(-1, 2)))
+    trucks = max(3, int(len(zones) * 4 + _randint(-2, 5)))
+    drones = max(1, int(len(zones) + severity + _randint(0, 4)))
+    helicopters = 0 if severity < 3 else _randint(1, 4)
+    
+    return _scenario_record(
+        f"cyclone_{direction.lower()}_{severity}_{idx}", "cyclone", severity, max(2000, population),
+        zones, hospital_load, blocked,
+        {
+            "max_wind_speed_kmph": max(60, wind_speed),
+            "cyclone_translation_speed_kmph": translation_speed,
+            "cyclone_direction": direction
         },
-        "resources_deployed": {
+        {
             "medical_kits": max(150, medical_kits),
             "boats": max(0, boats),
             "trucks": max(3, trucks),
@@ -140,70 +157,46 @@ def generate_cyclone_scenario(idx, severity, direction):
             "water_liters": max(8000, water_liters),
             "shelter_kits": max(60, shelter_kits)
         },
-        "outcome": "successful",
-        "response_time_min": 25 + severity * 12 + random.randint(-5, 18),
-        "notes": f"{severity_labels[severity]} cyclone moving {direction}"
-    }
+        25 + severity * 12 + _randint(-5, 18),
+        f"{SEVERITY_LABELS[severity]} cyclone moving {direction}"
+    )
 
 def generate_earthquake_scenario(idx, severity, distance_category):
     """Generate an earthquake scenario"""
-    severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
-    
-    base_pop = random.randint(10000, 25000) * severity
-    population = base_pop + random.randint(-5000, 10000)
-    
-    base_load = 40 + severity * 12 + random.randint(-5, 12)
-    hospital_load = min(99, max(30, base_load))
+    population = _population(severity, (10000, 25000), (-5000, 10000))
+    hospital_load = _hospital_load(severity, 40, 12, (-5, 12), 30)
     
     # Magnitude based on severity
-    magnitude = 3.5 + severity * 0.9 + random.uniform(-0.3, 0.5)
+    magnitude = 3.5 + severity * 0.9 + _uniform(-0.3, 0.5)
     
     # Distance categories: near, medium, far
-    distances = {"near": (10, 30), "medium": (30, 60), "far": (60, 100)}
-    dist_range = distances.get(distance_category, (30, 60))
-    epicenter_distance = random.randint(dist_range[0], dist_range[1])
+    dist_range = DISTANCE_RANGES.get(distance_category, (30, 60))
+    epicenter_distance = _randint(dist_range[0], dist_range[1])
     
     # Collapse ratio based on magnitude and distance
     base_collapse = (magnitude - 4) * 0.08 - (epicenter_distance / 500)
-    collapse_ratio = max(0.01, min(0.5, base_collapse + random.uniform(-0.03, 0.05)))
-    
-    all_zones = ["East", "West", "North", "South", "Central"]
-    num_zones = min(len(all_zones), max(1, severity + random.randint(-1, 1)))
-    zones = random.sample(all_zones, num_zones)
-    
-    all_roads = ["Anna Salai", "Mount Road", "GST Road", "OMR", "ECR"]
-    num_blocked = min(len(all_roads), max(0, int(collapse_ratio * 15) + random.randint(0, 2)))
-    blocked = random.sample(all_roads, num_blocked) if num_blocked > 0 else []
-    
-    medical_kits = int(population * 0.08 * (severity / 3.0) * (1 + collapse_ratio) + random.randint(-200, 300))
-    food_packets = int(population * 0.2 + random.randint(-700, 700))
-    water_liters = int(population * 3 + random.randint(-7000, 14000))
-    shelter_kits = int(population * 0.01 * (1 + collapse_ratio * 5) + random.randint(-30, 80))
-    trucks = max(4, int(len(zones) * 4 + severity + random.randint(-2, 6)))
-    drones = max(2, int(len(zones) * 2 + severity + random.randint(0, 5)))
-    helicopters = 0 if severity < 3 or collapse_ratio < 0.1 else random.randint(1, 5)
-    
-    return {
-        "id": f"earthquake_{distance_category}_{severity}_{idx}",
-        "disaster_type": "earthquake",
-        "city": "Chennai",
-        "severity": severity,
-        "severity_level": severity,
-        "severity_label": severity_labels[severity],
-        "population_affected": max(3000, population),
-        "zones_affected": zones,
-        "zones_impacted": zones,
-        "hospital_load": round(hospital_load / 100, 2),
-        "hospital_load_pct": hospital_load,
-        "blocked_roads": blocked,
-        "disaster_specific": {
-            "earthquake": {
-                "magnitude": round(max(3.0, magnitude), 1),
-                "epicenter_distance_km": epicenter_distance,
-                "building_collapse_ratio": round(collapse_ratio, 2)
-            }
+    collapse_ratio = max(0.01, min(0.5, base_collapse + _uniform(-0.03, 0.05)))
+    
+    zones = _pick_zones(severity + _randint(-1, 1))
+    blocked = _pick_blocked(EARTHQUAKE_ROADS, int(collapse_ratio * 15) + _randint(0, 2))
+    
+    medical_kits = int(population * 0.08 * (severity / 3.0) * (1 + collapse_ratio) + _randint(-200, 300))
+    food_packets = int(population * 0.2 + _randint(-700, 700))
+    water_liters = int(population * 3 + _randint(-7000, 14000))
+    shelter_kits = int(population * 0.01 * (1 + collapse_ratio * 5) + _randint(-30, 80))
+    trucks = max(4, int(len(zones) * 4 + severity + _randint(-2, 6)))
+    drones = max(2, int(len(zones) * 2 + severity + _randint(0, 5)))
+    helicopters = 0 if severity < 3 or collapse_ratio < 0.1 else _randint(1, 5)
+    
+    return _scenario_record(
+        f"earthquake_{distance_category}_{severity}_{idx}", "earthquake", severity, max(3000, population),
+        zones, hospital_load, blocked,
+        {
+            "magnitude": round(max(3.0, magnitude), 1),
+            "epicenter_distance_km": epicenter_distance,
+            "building_collapse_ratio": round(collapse_ratio, 2)
         },
-        "resources_deployed": {
+        {
             "medical_kits": max(200, medical_kits),
             "boats": 0,
             "trucks": max(4, trucks),
@@ -213,63 +206,42 @@ def generate_earthquake_scenario(idx, severity, distance_category):
             "water_liters": max(10000, water_liters),
             "shelter_kits": max(80, shelter_kits)
         },
-        "outcome": "successful",
-        "response_time_min": 30 + severity * 15 + random.randint(-8, 20),
-        "notes": f"{severity_labels[severity]} earthquake, epicenter {epicenter_distance}km away"
-    }
+        30 + severity * 15 + _randint(-8, 20),
+        f"{SEVERITY_LABELS[severity]} earthquake, epicenter {epicenter_distance}km away"
+    )
 
 def generate_heatwave_scenario(idx, severity, humidity_level):
     """Generate a heatwave scenario"""
-    severity_labels = {1: "Low", 2: "Moderate", 3: "High", 4: "Very High", 5: "Critical"}
-    
-    base_pop = random.randint(6000, 18000) * severity
-    population = base_pop + random.randint(-2500, 6000)
-    
-    base_load = 30 + severity * 11 + random.randint(-4, 8)
-    hospital_load = min(99, max(20, base_load))
+    population = _population(severity, (6000, 18000), (-2500, 6000))
+    hospital_load = _hospital_load(severity, 30, 11, (-4, 8), 20)
     
     # Temperature based on severity
-    temperature = 38 + severity * 3 + random.randint(-2, 4)
+    temperature = 38 + severity * 3 + _randint(-2, 4)
     
     # Humidity categories: low, medium, high
-    humidities = {"low": (10, 25), "medium": (25, 45), "high": (45, 70)}
-    hum_range = humidities.get(humidity_level, (25, 45))
-    humidity = random.randint(hum_range[0], hum_range[1])
-    
-    duration = severity + random.randint(0, 4)
-    
-    all_zones = ["East", "West", "North", "South", "Central"]
-    num_zones = min(len(all_zones), max(1, severity - 1 + random.randint(0, 2)))
-    zones = random.sample(all_zones, num_zones)
-    
-    medical_kits = int(population * 0.08 * (severity / 3.0) + random.randint(-100, 200))
-    food_packets = int(population * 0.2 + random.randint(-400, 400))
-    water_liters = int(population * 5 + random.randint(-5000, 15000))  # More water for heatwaves
-    shelter_kits = int(population * 0.005 + random.randint(-10, 30))
-    trucks = max(3, int(len(zones) * 3 + random.randint(-1, 4)))
-    drones = max(1, int(len(zones) + random.randint(0, 2)))
-    
-    return {
-        "id": f"heatwave_{humidity_level}_{severity}_{idx}",
-        "disaster_type": "heatwave",
-        "city": "Chennai",
-        "severity": severity,
-        "severity_level": severity,
-        "severity_label": severity_labels[severity],
-        "population_affected": max(1500, population),
-        "zones_affected": zones,
-        "zones_impacted": zones,
-        "hospital_load": round(hospital_load / 100, 2),
-        "hospital_load_pct": hospital_load,
-        "blocked_roads": [],
-        "disaster_specific": {
-            "heatwave": {
-                "max_temp_c": max(38, temperature),
-                "humidity_pct": humidity,
-                "duration_days": max(1, duration)
-            }
+    hum_range = HUMIDITY_RANGES.get(humidity_level, (25, 45))
+    humidity = _randint(hum_range[0], hum_range[1])
+    
+    duration = severity + _randint(0, 4)
+    
+    zones = _pick_zones(severity - 1 + _randint(0, 2))
+    
+    medical_kits = int(population * 0.08 * (severity / 3.0) + _randint(-100, 200))
+    food_packets = int(population * 0.2 + _randint(-400, 400))
+    water_liters = int(population * 5 + _randint(-5000, 15000))  # More water for heatwaves
+    shelter_kits = int(population * 0.005 + _randint(-10, 30))
+    trucks = max(3, int(len(zones) * 3 + _randint(-1, 4)))
+    drones = max(1, int(len(zones) + _randint(0, 2)))
+    
+    return _scenario_record(
+        f"heatwave_{humidity_level}_{severity}_{idx}", "heatwave", severity, max(1500, population),
+        zones, hospital_load, [],
+        {
+            "max_temp_c": max(38, temperature),
+            "humidity_pct": humidity,
+            "duration_days": max(1, duration)
         },
-        "resources_deployed": {
+        {
             "medical_kits": max(100, medical_kits),
             "boats": 0,
             "trucks": max(3, trucks),
@@ -279,40 +251,34 @@ def generate_heatwave_scenario(idx, severity, humidity_level):
             "water_liters": max(8000, water_liters),
             "shelter_kits": max(30, shelter_kits)
         },
-        "outcome": "successful",
-        "response_time_min": 15 + severity * 8 + random.randint(-3, 12),
-        "notes": f"{severity_labels[severity]} heatwave with {humidity_level} humidity"
-    }
+        15 + severity * 8 + _randint(-3, 12),
+        f"{SEVERITY_LABELS[severity]} heatwave with {humidity_level} humidity"
+    )
 
 def main():
     """Generate comprehensive training dataset"""
-    random.seed(42)  # For reproducibility
+    _rng.seed(42)  # For reproducibility
     
     scenarios_dir = os.path.join(os.path.dirname(__file__), 'app', 'data', 'scenarios')
     os.makedirs(scenarios_dir, exist_ok=True)
     
-    generated_count = 0
+    # Build every scenario in memory first, then write them in one pass
+    scenarios = []
     
     # Generate flood scenarios (15 total)
     print("Generating flood scenarios...")
     for severity in range(1, 6):
         for i, is_coastal in enumerate([True, False, True]):
             scenario = generate_flood_scenario(i + 1, severity, is_coastal)
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # Generate cyclone scenarios (15 total)
     print("Generating cyclone scenarios...")
     directions = ["NE", "E", "SE", "N", "NW"]
     for severity in range(1, 6):
-        for i, direction in enumerate(random.sample(directions, 3)):
+        for i, direction in enumerate(_sample(directions, 3)):
             scenario = generate_cyclone_scenario(i + 1, severity, direction)
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # Generate earthquake scenarios (15 total)
     print("Generating earthquake scenarios...")
@@ -320,10 +286,7 @@ def main():
     for severity in range(1, 6):
         for i, distance in enumerate(distances):
             scenario = generate_earthquake_scenario(i + 1, severity, distance)
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
+            scenarios.append(scenario)
     
     # Generate heatwave scenarios (15 total)
     print("Generating heatwave scenarios...")
@@ -331,31 +294,40 @@ def main():
     for severity in range(1, 6):
         for i, humidity in enumerate(humidities):
             scenario = generate_heatwave_scenario(i + 1, severity, humidity)
-            filepath = os.path.join(scenarios_dir, f"{scenario['id']}.json")
-            with open(filepath, 'w') as f:
-                json.dump(scenario, f, indent=2)
-            generated_count += 1
-    
-    print(f"\n✅ Generated {generated_count} training scenarios")
+            scenarios.append(scenario)
+    
+    # --ndjson writes one training_scenarios.ndjson instead of a file per scenario;
+    # each mode removes the other's output so no scenario is on disk twice
+    ndjson_path = os.path.join(scenarios_dir, "training_scenarios.ndjson")
+    if "--ndjson" in sys.argv:
+        write_scenarios_ndjson(scenarios, ndjson_path)
+    else:
+        if os.path.exists(ndjson_path):
+            os.remove(ndjson_path)
+        # Compact JSON by default; --pretty indents the files for reading by hand,
+        # --force rewrites files even when their contents are unchanged
+        written = write_scenarios(scenarios, scenarios_dir, pretty="--pretty" in sys.argv,
+                                  force="--force" in sys.argv)
+        if written < len(scenarios):
+            print(f"   {len(scenarios) - written} unchanged files left as they were")
+    print(f"\n✅ Generated {len(scenarios)} training scenarios")
     print(f"📁 Saved to: {scenarios_dir}")
     
     # List all scenario files
-    all_files = [f for f in os.listdir(scenarios_dir) if f.endswith('.json')]
-    print(f"\n📊 Total scenario files: {len(all_files)}")
-    
-    # Summary by disaster type
-    flood_count = len([f for f in all_files if 'flood' in f.lower()])
-    cyclone_count = len([f for f in all_files if 'cyclone' in f.lower()])
-    earthquake_count = len([f for f in all_files if 'earthquake' in f.lower()])
-    heatwave_count = len([f for f in all_files if 'heatwave' in f.lower()])
+    total_files, counts = count_scenario_files(scenarios_dir)
+    print(f"\n📊 Total scenario files: {total_files}")
     
-    print(f"\n   Flood scenarios: {flood_count}")
-    print(f"   Cyclone scenarios: {cyclone_count}")
-    print(f"   Earthquake scenarios: {earthquake_count}")
-    print(f"   Heatwave scenarios: {heatwave_count}")
+    print(f"\n   Flood scenarios: {counts['flood']}")
+    print(f"   Cyclone scenarios: {counts['cyclone']}")
+    print(f"   Earthquake scenarios: {counts['earthquake']}")
+    print(f"   Heatwave scenarios: {counts['heatwave']}")
 
 if __name__ == "__main__":
-    main()
+    # --profile shows whether encoding, random draws or file writes dominate a run
+    if "--profile" in sys.argv:
+        profile_main(main)
+    else:
+        main()
 
 
 # touch update 11/29/2025 12:45:26
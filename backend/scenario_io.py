@@ -0,0 +1,117 @@
+"""
+Shared scenario file I/O for the training data generators
+"""
+import json
+import os
+import random
+
+# orjson encodes several times faster than json; fall back when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# One generator instance, seeded in each script's main(); the scripts alias its
+# bound methods so the hot paths skip the random module attribute lookups
+rng = random.Random()
+
+# Raw os.open flags for the scenario files (O_BINARY keeps Windows from translating newlines)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _unchanged(filepath, payload):
+    """True when filepath already holds exactly payload (size checked before reading)"""
+    try:
+        if os.stat(filepath).st_size != len(payload):
+            return False
+        with open(filepath, 'rb') as f:
+            return f.read() == payload
+    except OSError:
+        return False
+
+def write_scenarios(scenarios, scenarios_dir, pretty=False, force=False):
+    """
+    Write each scenario to <id>.json in scenarios_dir (UTF-8, compact unless pretty)
+    Files already holding identical bytes are left alone unless force is set.
+    Returns the number of files written.
+    """
+    prefix = os.path.join(scenarios_dir, "")
+    written = 0
+    for scenario in scenarios:
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(scenario, option=orjson.OPT_INDENT_2 if pretty else None)
+        elif pretty:
+            payload = json.dumps(scenario, indent=2, ensure_ascii=False).encode('utf-8')
+        else:
+            payload = json.dumps(scenario, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+        filepath = prefix + scenario['id'] + ".json"
+        # Generation is seeded, so reruns mostly reproduce the files already on disk
+        if not force and _unchanged(filepath, payload):
+            continue
+        # Encoded up front, so a single os.write replaces the buffered file object
+        fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        written += 1
+    return written
+
+def write_scenarios_ndjson(scenarios, filepath):
+    """
+    Write every scenario to a single newline-delimited JSON file (UTF-8)
+    The <id>.json files it replaces are removed, so loaders don't read a scenario twice.
+    """
+    # Lines are collected in memory and written with one os.write
+    buf = bytearray()
+    for scenario in scenarios:
+        if ORJSON_AVAILABLE:
+            buf += orjson.dumps(scenario)
+        else:
+            buf += json.dumps(scenario, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+        buf += b"\n"
+    fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+    prefix = os.path.join(os.path.dirname(filepath), "")
+    for scenario in scenarios:
+        try:
+            os.remove(prefix + scenario['id'] + ".json")
+        except FileNotFoundError:
+            pass
+
+def count_scenario_files(scenarios_dir):
+    """Count scenarios (.json files and .ndjson records), in total and per disaster type, in one directory pass"""
+    total = 0
+    counts = dict.fromkeys(("flood", "cyclone", "earthquake", "heatwave"), 0)
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    with os.scandir(scenarios_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                names = [entry.name.lower()]
+            elif entry.name.endswith('.ndjson'):
+                with open(entry.path, 'rb') as f:
+                    names = [loads(line).get('id', '').lower() for line in f if line.strip()]
+            else:
+                continue
+            total += len(names)
+            for name in names:
+                for disaster_type in counts:
+                    if disaster_type in name:
+                        counts[disaster_type] += 1
+    return total, counts
+
+def profile_main(main):
+    """Run main() under cProfile and print the top hotspots by cumulative time"""
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    main()
+    profiler.disable()
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+
+
+# touch update 11/29/2025 12:45:26
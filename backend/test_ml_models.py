@@ -1,24 +1,23 @@
 """
 Test ML models to verify they work correctly
 """
+import heapq
 import sys
 import os
+from unittest.mock import patch
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.ml_models import DemandPredictionModel, ScenarioClassifier
-import pickle
+from app.ml_models import DemandPredictionModel, ScenarioClassifier, MODEL_DIR
 
 def test_models():
     print("=" * 60)
     print("Testing ML Models")
     print("=" * 60)
     
-    model_dir = os.path.join(os.path.dirname(__file__), 'app', 'models')
-    
     # Test demand prediction model
     print("\n📊 Testing Demand Prediction Model...")
     demand_model = DemandPredictionModel()
-    demand_model.load(model_dir)
+    demand_model.load(MODEL_DIR)
     
     if demand_model.is_trained:
         print("   ✅ Model loaded successfully")
@@ -52,7 +51,8 @@ def test_models():
         if importance:
             print("\n   🔍 Top features (medical_kits):")
             if "medical_kits" in importance:
-                top_features = sorted(importance["medical_kits"].items(), key=lambda x: x[1], reverse=True)[:5]
+                # Partial selection of the top 5, same order as a full descending sort
+                top_features = heapq.nlargest(5, importance["medical_kits"].items(), key=lambda x: x[1])
                 for feat, imp in top_features:
                     print(f"      - {feat}: {imp:.2f}")
     else:
@@ -62,15 +62,8 @@ def test_models():
     print("\n\n🎯 Testing Risk Classifier...")
     classifier = ScenarioClassifier()
     
-    classifier_path = os.path.join(model_dir, 'classifier.pkl')
-    if os.path.exists(classifier_path):
-        with open(classifier_path, 'rb') as f:
-            classifier_data = pickle.load(f)
-        classifier.vectorizer = classifier_data.get('vectorizer')
-        classifier.model = classifier_data.get('model')
-        classifier.num_features_count = classifier_data.get('num_features_count', 5)
-        classifier.is_trained = True
-        
+    classifier.load(MODEL_DIR)
+    if classifier.is_trained:
         print("   ✅ Classifier loaded successfully")
         
         # Test predictions at different severity levels
@@ -82,8 +75,8 @@ def test_models():
         ]
         
         print("\n   📋 Test predictions:")
-        for scenario in test_scenarios:
-            risk = classifier.predict_risk_level(scenario)
+        risks = classifier.predict_risk_levels(test_scenarios)
+        for scenario, risk in zip(test_scenarios, risks):
             print(f"      Severity {scenario['severity_level']} {scenario['disaster_type']}: {risk}")
     else:
         print("   ❌ Classifier not found")
@@ -143,8 +136,36 @@ def test_models():
     print("Testing Complete!")
     print("=" * 60)
 
+def test_text_cache_eviction():
+    """Batches larger than the TF-IDF row cache must still classify every scenario"""
+    print("\n🧪 Testing classifier text cache eviction...")
+    classifier = ScenarioClassifier()
+    classifier.load(MODEL_DIR)
+    if not classifier.is_trained:
+        print("   ⏭️  Classifier not found, skipped")
+        return
+    
+    scenarios = [
+        {"disaster_type": "flood", "severity_level": i % 5 + 1, "population_affected": 5000 + i * 1000,
+         "hospital_load_pct": 30 + i * 5, "zones_impacted": ["East"], "blocked_roads": [],
+         "notes": f"Scenario {i}"}
+        for i in range(12)
+    ]
+    expected = classifier.predict_risk_levels(scenarios)
+    
+    # A tiny cache forces evictions while earlier single calls have left hits behind
+    classifier._text_cache = {}
+    with patch.object(ScenarioClassifier, "TEXT_CACHE_SIZE", 4):
+        for scenario in scenarios:
+            classifier.predict_risk_level(scenario)
+        risks = classifier.predict_risk_levels(scenarios)
+        assert risks == expected, f"{risks} != {expected}"
+        assert len(classifier._text_cache) <= 4
+    print("   ✅ Evicting cache returned the same risk levels")
+
 if __name__ == "__main__":
     test_models()
+    test_text_cache_eviction()
 
 
 # touch update 11/29/2025 12:45:26